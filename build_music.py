@@ -0,0 +1,46 @@
+#!/usr/bin/python
+# Encodes every .wav song in pygine/assets/music to an .ogg next to it. play_song picks the .ogg when there is one.
+# Needs oggenc or ffmpeg. Songs whose .ogg is newer than the .wav are skipped.
+import os
+import shutil
+import subprocess
+import sys
+
+MUSIC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pygine", "assets", "music")
+QUALITY = 4
+
+
+def encode_command(source, destination):
+    if shutil.which("oggenc") is not None:
+        return ["oggenc", "--quiet", "--quality", str(QUALITY), "--output", destination, source]
+    if shutil.which("ffmpeg") is not None:
+        return ["ffmpeg", "-loglevel", "error", "-y", "-i", source, "-codec:a", "libvorbis", "-qscale:a", str(QUALITY),
+                destination]
+    return None
+
+
+def main():
+    if encode_command("", "") is None:
+        print("Could not find oggenc or ffmpeg, the songs were not encoded.", file=sys.stderr)
+        return 1
+
+    for filename in sorted(os.listdir(MUSIC_PATH)):
+        if not filename.endswith(".wav"):
+            continue
+        source = os.path.join(MUSIC_PATH, filename)
+        destination = os.path.splitext(source)[0] + ".ogg"
+        if os.path.isfile(destination) and os.path.getmtime(destination) >= os.path.getmtime(source):
+            continue
+
+        subprocess.check_call(encode_command(source, destination))
+        print("{} -> {} ({} KB -> {} KB)".format(
+            filename,
+            os.path.basename(destination),
+            os.path.getsize(source) // 1024,
+            os.path.getsize(destination) // 1024
+        ))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,21 @@
 #!/usr/bin/python
+import sys
+from pygine import profiler
+
+# python main.py --profile-startup prints how long each part of startup took, once the first frame is on screen.
+if "--profile-startup" in sys.argv:
+    profiler.start_profiling()
+
+import pygame
+profiler.mark("import pygame")
+import pygine.resource
+profiler.mark("import pygine.resource")
+import pygine.entities
+profiler.mark("import pygine.entities")
+import pygine.scenes
+profiler.mark("import pygine.scenes")
 from pygine.root import Game
+profiler.mark("import pygine.root")
+
 game = Game()
 game.run()
@@ -11,16 +11,22 @@ class PygineObject(object):
         self.location = Vector2(self.x, self.y)
         self.center = Vector2(self.x + self.width / 2, self.y + self.height / 2)
         self.bounds = Rect(self.x, self.y, self.width, self.height)
+        # The SpatialHash this object is in, if any. It is kept up to date whenever the bounds change.
+        self.spatial_hash = None
 
     def set_width(self, width):
         self.width = width
         self.center = Vector2(self.x + self.width / 2, self.y + self.height / 2)
         self.bounds = Rect(self.x, self.y, self.width, self.height)
+        if self.spatial_hash is not None:
+            self.spatial_hash.update(self)
 
     def set_height(self, height):
         self.height = height
         self.center = Vector2(self.x + self.width / 2, self.y + self.height / 2)
         self.bounds = Rect(self.x, self.y, self.width, self.height)
+        if self.spatial_hash is not None:
+            self.spatial_hash.update(self)
 
     def set_location(self, x, y):
         self.x = x
@@ -28,3 +34,5 @@ class PygineObject(object):
         self.location = Vector2(self.x, self.y)
         self.center = Vector2(self.x + self.width / 2, self.y + self.height / 2)
         self.bounds = Rect(self.x, self.y, self.width, self.height)
+        if self.spatial_hash is not None:
+            self.spatial_hash.update(self)
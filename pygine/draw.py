@@ -1,7 +1,18 @@
+import math
 import pygame
+from collections import OrderedDict
 from pygine.maths import Vector2
 from pygine.utilities import Camera, Color, CameraType, StaticCamera
 
+# Scaled copies of images, keyed on (image, width, height) and evicted least recently used first.
+SCALED_IMAGE_CACHE_LIMIT = 8 * 1024 * 1024
+__scaled_images = OrderedDict()
+__scaled_images_size = 0
+
+# A stack of (surface, draw calls) recordings. Draw calls onto a recorded surface are collected as
+# (area, function, arguments) instead of being drawn.
+__recordings = []
+
 
 def __scaled_location(x, y, camera_type):
     if camera_type == CameraType.DYNAMIC:
@@ -14,54 +25,183 @@ def __scaled_value(value):
     return value * Camera.scale
 
 
+def __image_size_in_bytes(image):
+    return image.get_width() * image.get_height() * image.get_bytesize()
+
+
+def __area(x, y, width, height):
+    "A generous integer bounding box, so that rounding inside pygame never draws outside of it."
+    return (
+        int(math.floor(x)) - 1,
+        int(math.floor(y)) - 1,
+        int(math.ceil(width)) + 2,
+        int(math.ceil(height)) + 2
+    )
+
+
+def __recording_for(surface):
+    for recorded_surface, draw_calls in reversed(__recordings):
+        if recorded_surface is surface:
+            return draw_calls
+    return None
+
+
+def __submit(surface, area, function, arguments):
+    draw_calls = __recording_for(surface)
+    if draw_calls is None:
+        function(surface, *arguments)
+    else:
+        draw_calls.append((area, function, arguments))
+
+
+def start_recording_draw_calls(surface):
+    __recordings.append((surface, []))
+
+
+def stop_recording_draw_calls():
+    return __recordings.pop()[1]
+
+
+def replay_draw_calls(surface, draw_calls, clip=None):
+    "Draw previously recorded draw calls. If a clip Rect is given only the calls that touch it are drawn."
+    # Consecutive blits are handed to pygame in a single Surface.blits call.
+    blits = []
+    for area, function, arguments in draw_calls:
+        if clip is not None and not clip.colliderect(area):
+            continue
+        if function is pygame.Surface.blit:
+            blits.append(arguments)
+            continue
+        if len(blits) > 0:
+            surface.blits(blits, False)
+            blits = []
+        function(surface, *arguments)
+
+    if len(blits) > 0:
+        surface.blits(blits, False)
+
+
+def changed_draw_call_areas(previous_draw_calls, draw_calls):
+    "The areas of the draw calls that are not the same in both lists, or that are drawn in a different order."
+    previous = set(previous_draw_calls)
+    current = set(draw_calls)
+    areas = [area for area, _, _ in previous.symmetric_difference(current)]
+
+    # Calls that are in both lists still change the picture when they overlap and swap places, so the calls that were
+    # kept are compared by position. Added and removed calls are left out, so they do not shift everything after them.
+    kept_previous = [c for c in previous_draw_calls if c in current]
+    kept = [c for c in draw_calls if c in previous]
+    for previous_call, call in zip(kept_previous, kept):
+        if previous_call != call:
+            areas.append(previous_call[0])
+            areas.append(call[0])
+    for previous_call in kept_previous[len(kept):]:
+        areas.append(previous_call[0])
+    for call in kept[len(kept_previous):]:
+        areas.append(call[0])
+
+    return areas
+
+
+def submit_draw_calls(surface, draw_calls):
+    "Replay a layer of recorded draw calls, or hand them over to an outer recording of the same surface."
+    outer_draw_calls = __recording_for(surface)
+    if outer_draw_calls is None:
+        replay_draw_calls(surface, draw_calls)
+    else:
+        outer_draw_calls.extend(draw_calls)
+
+
+def clear_scaled_image_cache():
+    "Forget every scaled image. Call this whenever the scale of the cameras changes."
+    global __scaled_images_size
+    __scaled_images.clear()
+    __scaled_images_size = 0
+
+
+def __scaled_image(image, width, height):
+    global __scaled_images_size
+    if image.get_width() == width and image.get_height() == height:
+        return image
+
+    key = (image, width, height)
+    scaled = __scaled_images.get(key)
+    if scaled is not None:
+        __scaled_images.move_to_end(key)
+        return scaled
+
+    scaled = pygame.transform.scale(image, (width, height))
+    __scaled_images[key] = scaled
+    __scaled_images_size += __image_size_in_bytes(scaled)
+    while __scaled_images_size > SCALED_IMAGE_CACHE_LIMIT and len(__scaled_images) > 1:
+        _, evicted = __scaled_images.popitem(last=False)
+        __scaled_images_size -= __image_size_in_bytes(evicted)
+
+    return scaled
+
+
 def draw_rectangle(surface, rect, camera_type, color=Color.WHITE):
-    pygame.draw.rect(
+    location = __scaled_location(rect.x, rect.y, camera_type)
+    width = __scaled_value(rect.width)
+    height = __scaled_value(rect.height)
+    __submit(
         surface,
-        color,
-        (
-            __scaled_location(rect.x, rect.y, camera_type).x,
-            __scaled_location(rect.x, rect.y, camera_type).y,
-            __scaled_value(rect.width),
-            __scaled_value(rect.height)
-        )
+        __area(location.x, location.y, width, height),
+        pygame.draw.rect,
+        (color, (location.x, location.y, width, height))
     )
 
 
 def draw_circle(surface, center, radius, camera_type, color=Color.WHITE, thickness=0):
-    pygame.draw.circle(
+    location = __scaled_location(center.x, center.y, camera_type)
+    x = int(location.x)
+    y = int(location.y)
+    radius = int(__scaled_value(radius))
+    __submit(
         surface,
-        color,
-        (
-            int(__scaled_location(center.x, center.y, camera_type).x),
-            int(__scaled_location(center.x, center.y, camera_type).y),
-        ),
-        int(__scaled_value(radius)),
-        int(__scaled_value(thickness))
+        __area(x - radius, y - radius, radius * 2, radius * 2),
+        pygame.draw.circle,
+        (color, (x, y), radius, int(__scaled_value(thickness)))
     )
 
 
 def draw_line(surface, x1, y1, x2, y2, camera_type, color=Color.WHITE, thickness=1):
-    pygame.draw.line(
+    start = __scaled_location(x1, y1, camera_type)
+    end = __scaled_location(x2, y2, camera_type)
+    thickness = int(__scaled_value(thickness))
+    __submit(
         surface,
-        color,
-        [__scaled_location(x1, y1, camera_type).x, __scaled_location(x1, y1, camera_type).y],
-        [__scaled_location(x2, y2, camera_type).x, __scaled_location(x2, y2, camera_type).y],
-        int(__scaled_value(thickness))
+        __area(
+            min(start.x, end.x) - thickness,
+            min(start.y, end.y) - thickness,
+            abs(start.x - end.x) + thickness * 2,
+            abs(start.y - end.y) + thickness * 2
+        ),
+        pygame.draw.line,
+        (color, (start.x, start.y), (end.x, end.y), thickness)
     )
 
 
 def draw_image(surface, image, rect, camera_type):
-    image = pygame.transform.scale(
+    image = __scaled_image(
         image,
-        (
-            int(__scaled_value(rect.width)),
-            int(__scaled_value(rect.height))
-        )
+        int(__scaled_value(rect.width)),
+        int(__scaled_value(rect.height))
     )
-    surface.blit(
-        image,
-        (
-            __scaled_location(rect.x, rect.y, camera_type).x,
-            __scaled_location(rect.x, rect.y, camera_type).y
-        )
+    location = __scaled_location(rect.x, rect.y, camera_type)
+    __submit(
+        surface,
+        __area(location.x, location.y, image.get_width(), image.get_height()),
+        pygame.Surface.blit,
+        (image, (location.x, location.y))
+    )
+
+
+def draw_surface(surface, image, location, area):
+    "Blit the given area of an image that is already scaled, at a location in screen space."
+    __submit(
+        surface,
+        __area(location[0], location[1], area[2], area[3]),
+        pygame.Surface.blit,
+        (image, location, area)
     )
@@ -5,13 +5,18 @@ from pygame import Rect
 from pygine.base import PygineObject
 from pygine.draw import draw_rectangle, draw_line
 from pygine.geometry import Rectangle
-from pygine.maths import Vector2, distance_between
+from pygine.maths import Vector2
 from pygine.resource import Animation, Sprite, SpriteType
 from pygine.utilities import Camera, CameraType, Color, Input, InputType, Timer
 from random import randint, random
 
 
 class Entity(PygineObject):
+    # Every entity that called set_location since the scene last sorted its entities.
+    moved = set()
+    # Every entity that was marked to be removed, but is still in a scene.
+    removed = set()
+
     def __init__(self, x=0, y=0, width=1, height=1):
         super(Entity, self).__init__(x, y, width, height)
         self.sprite = Sprite(x, y, SpriteType.NONE)
@@ -19,9 +24,21 @@ class Entity(PygineObject):
         self.layer = 0
         self.remove = False
         self.ignore = False
+        # Static entities never move once their scene is loaded, so scenes keep them in a StaticIndex.
+        self.static = False
         self.__bounds_that_actually_draw_correctly = Rectangle(
             self.x, self.y, self.width, self.height, self.color, 2)
 
+    @property
+    def remove(self):
+        return self.__remove
+
+    @remove.setter
+    def remove(self, remove):
+        self.__remove = remove
+        if remove:
+            Entity.removed.add(self)
+
     def set_color(self, color):
         self.color = color
         self.__bounds_that_actually_draw_correctly.color = color
@@ -29,6 +46,7 @@ class Entity(PygineObject):
     def set_location(self, x, y):
         super(Entity, self).set_location(x, y)
         self.__bounds_that_actually_draw_correctly.set_location(self.x, self.y)
+        Entity.moved.add(self)
 
     def update(self, delta_time, entities):
         raise NotImplementedError(
@@ -59,6 +77,8 @@ class Kinetic(Entity):
         self.facing = Direction.NONE
         self.collision_rectangles = []
         self.collision_width = 0
+        # The StaticIndex of the scene this entity is in, set by the scene.
+        self.static_colliders = None
 
     def _update_collision_rectangles(self):
         self.collision_width = self.move_speed + 1
@@ -76,6 +96,18 @@ class Kinetic(Entity):
     def _calculate_scaled_speed(self, delta_time):
         self.move_speed = self.default_move_speed * delta_time
 
+    def _static_colliders_near(self, area, entities):
+        "The static entities that overlap the given area, or every entity if the scene has not indexed them."
+        if self.static_colliders is None:
+            return entities
+        return self.static_colliders.query(area)
+
+    def _entities_near(self, area, entities):
+        "The entities that overlap the given area, or every entity if this one is not in a SpatialHash."
+        if self.spatial_hash is None:
+            return entities
+        return self.spatial_hash.query(area)
+
     def _collision(self, entities):
         raise NotImplementedError(
             "A class that inherits Kinetic did not implement the collision(surface) method")
@@ -176,7 +208,8 @@ class Player(Actor):
             self.set_location(entity.bounds.left - self.bounds.width, self.y)
 
     def _collision(self, entities):
-        for e in entities:
+        reach = int(math.ceil(self.collision_width)) * 2 + 2
+        for e in self._static_colliders_near(self.bounds.inflate(reach, reach), entities):
             if (
                     not e.ignore and
                     (
@@ -346,22 +379,16 @@ class NPC(Kinetic):
             else:
                 self.sprite.set_sprite(SpriteType.NPC_F_F)
 
-    def _within_radius(self, e):
-        if distance_between(self.center, e.center) <= self.radius:
+    def enter_proximity(self, target, entities):
+        if isinstance(target, Player) and not self.show_prompt:
             self.show_prompt = True
-        else:
-            self.show_prompt = False
+            entities.append(self.speech_bubble)
 
-    def _update_conversation(self, entities):
-        for e in entities:
-            if isinstance(e, Player):
-                last = self.show_prompt
-                self._within_radius(e)
-                if last != self.show_prompt:
-                    if self.show_prompt:
-                        entities.append(self.speech_bubble)
-                    else:
-                        entities.remove(self.speech_bubble)
+    def leave_proximity(self, target, entities):
+        if isinstance(target, Player) and self.show_prompt:
+            self.show_prompt = False
+            if self.speech_bubble in entities:
+                entities.remove(self.speech_bubble)
 
     def _update_animation(self, delta_time):
         if self.walking:
@@ -386,7 +413,8 @@ class NPC(Kinetic):
             self.set_location(entity.bounds.left - self.bounds.width, self.y)
 
     def _collision(self, entities):
-        for e in entities:
+        reach = int(math.ceil(self.collision_width)) * 2 + 2
+        for e in self._static_colliders_near(self.bounds.inflate(reach, reach), entities):
             if (
                     isinstance(e, Building) or
                     isinstance(e, Tree)
@@ -394,7 +422,6 @@ class NPC(Kinetic):
                 self._rectangle_collision_logic(e)
 
     def update(self, delta_time, entities):
-        self._update_conversation(entities)
         self._calculate_scaled_speed(delta_time)
         if self.can_move:
             self._walk(delta_time)
@@ -418,23 +445,13 @@ class Merchant(NPC):
         super(Merchant, self).__init__(x, y, type, can_move=False)
         self.speech_bubble.set_content(speech_content)
 
-    def _update_conversation(self, entities):
-        for e in entities:
-            if isinstance(e, Player):
-                last = self.show_prompt
-                self._within_radius(e)
-                if last != self.show_prompt:
-                    if self.show_prompt:
-                        entities.append(self.speech_bubble)
-                    else:
-                        entities.remove(self.speech_bubble)
-
 
 class Building(Entity):
     def __init__(self, x, y, width, height):
         super(Building, self).__init__(x, y, width, height)
         self.sprite = None
         self.shadow = None
+        self.static = True
 
     def update(self, delta_time, entities):
         pass
@@ -486,6 +503,7 @@ class Diner(Building):
 class Tree(Entity):
     def __init__(self, x, y):
         super(Tree, self).__init__(x, y, 20, 20)
+        self.static = True
         self.sprite = Sprite(self.x - 11 - 16, self.y -
                              21, SpriteType.TREE_CLUSTER)
         # self.shadow = Sprite(self.x - 11 - 8, self.y - 21,
@@ -506,6 +524,7 @@ class Furniture(Entity):
     def __init__(self, x, y, width, height):
         super(Furniture, self).__init__(x, y, width, height)
         self.sprite = None
+        self.static = True
 
     def update(self, delta_time, entities):
         pass
@@ -580,6 +599,7 @@ class Wall(Entity):
         super(Wall, self).__init__(
             x * 16, y * 16 + 10, width * 16, height * 16)
         self.set_color(Color.BLUE)
+        self.static = True
 
     def apply_an_offset(self, x_offset, y_offset):
         self.set_location(self.x + x_offset, self.y + y_offset)
@@ -652,7 +672,8 @@ class SellPad(Entity):
         self.direction = direction
 
     def __collision(self, entities):
-        for e in entities:
+        near = entities if self.spatial_hash is None else self.spatial_hash.query(self.bounds)
+        for e in near:
             if e.bounds.colliderect(self.bounds):
                 if isinstance(e, Player) and e.item_carrying is not None:
                     if e.input.pressing(InputType.A) and int(e.facing) == int(self.direction):
@@ -695,7 +716,7 @@ class Boat(Actor):
         self.shadow.set_location(self.x - 16 - 16, self.y - 16)
 
     def _collision(self, entities):
-        for e in entities:
+        for e in self._entities_near(self.bounds, entities):
             if not self.damaged:
                 if isinstance(e, Bullet) or isinstance(e, Octopus):
                     if self.bounds.colliderect(e.bounds):
@@ -957,22 +978,27 @@ class Hook(Actor):
         elif self.x + self.width > Camera.BOUNDS.width:
             self.x = Camera.BOUNDS.width - self.width
 
+    def __turn_around(self, entities):
+        if self.direction == -1:
+            return
+        self.direction = -1
+        for e in entities:
+            if isinstance(e, OceanWall):
+                e.set_direction(-1)
+
     def _collision(self, entities):
         if self.y + Camera.BOUNDS.height / 2 > self.ocean_depth:
-            self.direction = -1
+            self.__turn_around(entities)
             self.default_move_speed = 100
 
         self.__bounds_collision()
 
-        for e in entities:
-            if isinstance(e, OceanWall):
-                if self.direction == -1:
-                    e.set_direction(-1)
-            elif isinstance(e, Fishy) and not e.captured:
+        for e in self._entities_near(self.bounds, entities):
+            if isinstance(e, Fishy) and not e.captured:
                 if self.bounds.colliderect(e.bounds):
                     e.hook_fish()
                     self.total_hooked_fish += 1
-                    self.direction = -1
+                    self.__turn_around(entities)
 
     def _move(self, direction=Direction.NONE):
         self.facing = direction
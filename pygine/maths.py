@@ -5,6 +5,32 @@ def distance_between(vector_a, vector_b):
     return math.sqrt((vector_a.x - vector_b.x)**2 + (vector_a.y - vector_b.y)**2)
 
 
+def merge_cells(cells):
+    "Cover the True cells of a grid (a list of rows) with a few (x, y, width, height) rectangles, found greedily."
+    covered = [[False] * len(row) for row in cells]
+
+    def free(x, y):
+        return y < len(cells) and x < len(cells[y]) and cells[y][x] and not covered[y][x]
+
+    rectangles = []
+    for y in range(len(cells)):
+        for x in range(len(cells[y])):
+            if not free(x, y):
+                continue
+            width = 1
+            while free(x + width, y):
+                width += 1
+            height = 1
+            while all(free(x + i, y + height) for i in range(width)):
+                height += 1
+
+            for j in range(height):
+                for i in range(width):
+                    covered[y + j][x + i] = True
+            rectangles.append((x, y, width, height))
+    return rectangles
+
+
 class Vector2:
     "a poor man's vector class"
 
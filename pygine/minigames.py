@@ -0,0 +1,216 @@
+from pygame import Rect
+from pygine.draw import draw_rectangle
+from pygine.entities import Boat, Bullet, Coffee, Fish, Fishy, Hook, OceanWall, Octopus, Rock, SandWall
+from pygine.geometry import Rectangle
+from pygine.maths import Vector2
+from pygine.resource import SpriteType
+from pygine.scenes import Scene, SceneType
+from pygine.utilities import Camera, CameraType, Color, Timer
+from random import randint
+
+
+class Minigame(Scene):
+    def __init__(self):
+        super(Minigame, self).__init__()
+        self.show_money = False
+
+    def start_game(self):
+        raise NotImplementedError(
+            "A class that inherits Minigame did not implement the start_game() method")
+
+    def _exit_game(self, end_x, end_y, item, new_scene):
+        self.manager.queue_next_scene(new_scene, Vector2(end_x, end_y))
+        new_player = self.manager.get_scene(new_scene).player
+        new_player.set_location(end_x, end_y)
+        new_player.item_carrying = item
+        new_player.sprite.set_sprite(SpriteType.PLAYER_F)
+
+
+class CoffeeMinigame(Minigame):
+    def __init__(self):
+        super(CoffeeMinigame, self).__init__()
+        self._reset()
+        self._create_triggers()
+        self.song = "song_coffee.wav"
+
+    def start_game(self):
+        self._reset()
+        self.__game_timer.reset()
+        self.__game_timer.start()
+        self.__spawn_timer.reset()
+        self.__spawn_timer.start()
+
+    def _reset(self):
+        self.shapes = [
+            Rectangle(0, 0, 320, 16 * 4, Color.OCEAN_BLUE),
+            Rectangle(0, 16 * 4, 320, 16 * 11, Color.OCEAN_BLUE)
+        ]
+        self.sprites = []
+        self.entities = []
+        self.relay_player(
+            Boat(
+                16 * 4,
+                16 * 9
+            )
+        )
+
+        self.total_walls = int(Camera.BOUNDS.width / 64) + 2
+        self.wall_layers = 6
+        for x in range(self.total_walls):
+            for i in range(0, self.wall_layers):
+                self.entities.append(
+                    SandWall(x * 64, 16 * 2, i, self.wall_layers)
+                )
+
+        self.__game_timer = Timer(35 * 1000)
+        self.__spawn_timer = Timer(500)
+
+        self._sort_entities()
+
+    def _create_triggers(self):
+        pass
+
+    def __spawn_random(self):
+        grid_unit_size = 16
+        rand_x = Camera.BOUNDS.width + 8
+        rand_y = randint(4, 14) * grid_unit_size
+        if randint(1, 10) <= 3:
+            self.entities.append(Octopus(rand_x, rand_y))
+        else:
+            min_offset = 0
+            max_offset = 64
+            self.entities.append(Rock(rand_x, rand_y))
+            for i in range(randint(1, 5)):
+                self.entities.append(
+                    Rock(rand_x + randint(min_offset, max_offset), rand_y + randint(min_offset, max_offset)))
+
+    def update(self, delta_time):
+        self.__game_timer.update(delta_time)
+        if self.__game_timer.done:
+            # Game is over, change scene
+            self._exit_game(12 * 16 + 11, 8 * 16,
+                            Coffee(0, 0, self.player.beans), SceneType.OCEAN)
+        else:
+            if self.player.bounds.top > Camera.BOUNDS.height + 8 or self.player.bounds.right < 0:
+                self._exit_game(12 * 16 + 11, 8 * 16, None, SceneType.OCEAN)
+                return
+
+            self.__spawn_timer.update(delta_time)
+            if self.__spawn_timer.done:
+                if randint(1, 10) <= 5:
+                    self.__spawn_random()
+                self.__spawn_timer.reset()
+                self.__spawn_timer.start()
+
+            for e in self.entities:
+                if isinstance(e, SandWall):
+                    if e.bounds.right - 32 <= self.camera_viewport.bounds.left:
+                        e.set_location(e.x + self.total_walls * 64 - 64, e.y)
+                if isinstance(e, Bullet):
+                    if e.dead:
+                        e.remove = True
+                if e.sprite.x + e.sprite.width < 0:
+                    e.remove = True
+
+            # print(self.camera_viewport.bounds.left)
+            super(CoffeeMinigame, self).update(delta_time)
+
+    def draw(self, surface):
+        draw_rectangle(surface, self.player.playbounds,
+                       CameraType.DYNAMIC, Color.SKY_BLUE)
+        super(CoffeeMinigame, self).draw(surface)
+
+
+class CropMinigame(Scene):
+    def __init__(self):
+        super(CropMinigame, self).__init__()
+
+    def _reset(self):
+        pass
+
+
+class FishMinigame(Minigame):
+    def __init__(self):
+        super(FishMinigame, self).__init__()
+        self.song = "song_coffee.wav"
+
+    def start_game(self):
+        self._reset()
+
+    def total_fish_caught(self):
+        return self.player.total_hooked_fish
+
+    def _sort_key(self, e):
+        # The ocean walls are drawn behind the hook, and the hook behind the fish.
+        if isinstance(e, OceanWall):
+            layer = -(e.layer + 1)
+        elif isinstance(e, Hook):
+            layer = 100
+        else:
+            layer = 200
+        return (layer, super(FishMinigame, self)._sort_key(e))
+
+    def _reset(self):
+        self.ocean_depth = Camera.BOUNDS.height * 10
+        self.bounds = Rect(0, 0, Camera.BOUNDS.width, self.ocean_depth)
+        self.shapes = [
+            Rectangle(0, 0, Camera.BOUNDS.width,
+                      self.ocean_depth, Color.OCEAN_BLUE),
+            Rectangle(0, self.ocean_depth - 64,
+                      Camera.BOUNDS.width, 64, Color.BLACK),
+        ]
+        self.sprites = []
+        self.entities = []
+        self.total_walls = int(Camera.BOUNDS.height / 64) + 2
+        self.wall_layers = 3
+        for y in range(self.total_walls):
+            for i in range(0, self.wall_layers):
+                self.entities.append(
+                    OceanWall(y * 64, True, i, self.wall_layers))
+                self.entities.append(
+                    OceanWall(y * 64, False, i, self.wall_layers))
+        self.ocean_walls = list(self.entities)
+
+        self.fish_spawn_frequency = 1
+        for y in range(0, self.bounds.height, 16):
+            if randint(1, 10) <= int(self.fish_spawn_frequency):
+                self.entities.append(
+                    Fishy(y, True if randint(1, 10) <= 5 else False))
+            self.fish_spawn_frequency = y * 1.0 / self.ocean_depth * 10 + 1
+                
+        self.relay_player(Hook(self.ocean_depth))
+
+        self._sort_entities()
+
+    def _create_triggers(self):
+        pass
+
+    def update(self, delta_time):
+        super(FishMinigame, self).update(delta_time)
+
+        if self.player.y < Camera.BOUNDS.height / 2:
+            self._exit_game(
+                7 * 16 + 11, 3 * 16,
+                Fish(0, 0, self.total_fish_caught()),
+                SceneType.OCEAN
+            )
+            return
+
+        for e in self.ocean_walls:
+            if e.direction == 1 and e.bounds.bottom <= self.camera_viewport.bounds.top + Scene.VIEWPORT_BUFFER:
+                e.set_location(e.x, e.y + self.total_walls * 64)
+            elif e.direction == -1 and e.bounds.top >= self.camera_viewport.bounds.bottom - Scene.VIEWPORT_BUFFER:
+                e.set_location(e.x, e.y - self.total_walls * 64)
+
+        self._sort_entities()
+
+    def draw(self, surface):
+        super(FishMinigame, self).draw(surface)
+
+
+class EggsMinigame(Scene):
+    def __init__(self):
+        super(EggsMinigame, self).__init__()
+
+    def _reset(self):
+        pass
@@ -0,0 +1,42 @@
+import sys
+import time
+
+# Startup is only timed when main.py is run with --profile-startup, otherwise marks cost nothing.
+enabled = False
+__sections = []
+__start = 0
+__section_start = 0
+
+
+def start_profiling():
+    global enabled
+    global __start
+    global __section_start
+    enabled = True
+    __start = time.perf_counter()
+    __section_start = __start
+
+
+def mark(name):
+    "End the section of startup that is being timed, and call it name."
+    global __section_start
+    if not enabled:
+        return
+    now = time.perf_counter()
+    __sections.append((name, now - __section_start))
+    __section_start = now
+
+
+def report(file=sys.stdout):
+    "Print how long every section of startup took, and stop timing."
+    global enabled
+    if not enabled:
+        return
+    enabled = False
+
+    total = time.perf_counter() - __start
+    width = max([len(name) for name, _ in __sections] + [len("total")])
+    for name, seconds in __sections:
+        print("{} {:8.1f} ms {:5.1f}%".format(
+            name.ljust(width), seconds * 1000, seconds / total * 100), file=file)
+    print("{} {:8.1f} ms".format("total".ljust(width), total * 1000), file=file)
@@ -1,6 +1,12 @@
+import os
 import pygame
 import pygine.globals
+import struct
+import sys
+from array import array
+from collections import OrderedDict
 from enum import IntEnum
+from pygame import Rect
 from pygine.base import PygineObject
 from pygine.draw import draw_image
 from pygine.sounds import load_sound_paths
@@ -8,22 +14,239 @@ from pygine.utilities import Timer
 
 SPRITE_SHEET = None
 TEXT_SHEET = None
+# The sheet region of every SpriteType, indexed by the type itself.
+SPRITE_REGIONS = []
+# Bumped every time the sheets are prepared for a new display, so images made from older sheets can be replaced.
+CONTENT_VERSION = 0
+COLOR_KEY = (255, 0, 255)
+__sprite_sheet_source = None
+__text_sheet_source = None
+
+GLYPH_SIZE = 19
+GLYPH_SPACING = 15
+GLYPH_COLUMNS = 16
+TEXT_CACHE_LIMIT = 64
+__glyphs = None
+__text_images = OrderedDict()
+# Scene CSVs are compiled to a .grid file next to them: a header followed by width * height little endian int32 cells.
+# The header holds the size and modification time of the CSV, and the grid is compiled again when either changes.
+GRID_HEADER = struct.Struct("<4sHHHqq")
+GRID_MAGIC = b"GRID"
+GRID_VERSION = 1
+# Grids that were already read, keyed on the CSV name and stored with the (modification time, size) they were read at.
+__grids = {}
+# Images of sprite sheet regions, keyed on (sheet, x, y, width, height) and shared by every Sprite that uses them.
+__sprite_images = {}
+
+
+class ImageFormat(IntEnum):
+    OPAQUE = 0
+    COLOR_KEY = 1
+    ALPHA = 2
 
 
 def load_content():
-    global SPRITE_SHEET
-    global TEXT_SHEET
-    SPRITE_SHEET = pygame.image.load(
+    global __sprite_sheet_source
+    global __text_sheet_source
+    __sprite_sheet_source = pygame.image.load(
         '/home/cpi/games/Python/diner-mafia/pygine/assets/sprites/sprites.png' if pygine.globals.on_cpi
         else 'pygine/assets/sprites/sprites.png'
     )
-    TEXT_SHEET = pygame.image.load(
+    __text_sheet_source = pygame.image.load(
         '/home/cpi/games/Python/diner-mafia/pygine/assets/sprites/font.png' if pygine.globals.on_cpi
         else 'pygine/assets/sprites/font.png'
     )
+    load_sprite_regions()
+    prepare_content()
     load_sound_paths()
 
 
+def load_sprite_regions():
+    "Read where every SpriteType is on the sprite sheet from sprites.csv."
+    regions = [None] * len(SpriteType)
+    with open(
+        '/home/cpi/games/Python/diner-mafia/pygine/assets/sprites/sprites.csv' if pygine.globals.on_cpi
+        else 'pygine/assets/sprites/sprites.csv',
+        "r"
+    ) as file:
+        file.readline()
+        for line in file:
+            row = line.strip().split(",")
+            if len(row) < 5:
+                continue
+            regions[SpriteType[row[0]]] = tuple(int(v) for v in row[1:5])
+
+    for sprite_type in SpriteType:
+        if regions[sprite_type] is None:
+            raise ValueError(
+                "sprites.csv has no region for {}".format(sprite_type.name))
+
+    SPRITE_REGIONS[:] = regions
+
+
+def load_grid(name):
+    "The cells of a scene CSV as a list of rows of ints."
+    csv_path = (
+        '/home/cpi/games/Python/diner-mafia/pygine/assets/scenes/' if pygine.globals.on_cpi
+        else 'pygine/assets/scenes/'
+    ) + name + '.csv'
+    status = os.stat(csv_path)
+    stamp = (status.st_mtime_ns, status.st_size)
+
+    cached = __grids.get(name)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    grid_path = csv_path[:-len('.csv')] + '.grid'
+    rows = __read_grid(grid_path, stamp)
+    if rows is None:
+        rows = __compile_grid(csv_path, grid_path, stamp)
+    __grids[name] = (stamp, rows)
+    return rows
+
+
+def __read_grid(grid_path, stamp):
+    try:
+        with open(grid_path, "rb") as file:
+            magic, version, width, height, modified, size = GRID_HEADER.unpack(file.read(GRID_HEADER.size))
+            if magic != GRID_MAGIC or version != GRID_VERSION or (modified, size) != stamp:
+                return None
+            cells = array("i")
+            cells.fromfile(file, width * height)
+    except (OSError, EOFError, struct.error):
+        return None
+
+    if sys.byteorder != "little":
+        cells.byteswap()
+    return [cells[y * width:(y + 1) * width] for y in range(height)]
+
+
+def __compile_grid(csv_path, grid_path, stamp):
+    with open(csv_path, "r") as file:
+        rows = [array("i", (int(v) for v in line.split(","))) for line in file if line.strip() != ""]
+
+    width = len(rows[0]) if len(rows) > 0 else 0
+    for row in rows:
+        if len(row) != width:
+            raise ValueError(
+                "{} does not have the same number of columns on every row".format(csv_path))
+
+    cells = array("i")
+    for row in rows:
+        cells.extend(row)
+    if sys.byteorder != "little":
+        cells.byteswap()
+
+    # The grid is only a cache, so the game carries on with the parsed rows if it cannot be written.
+    try:
+        with open(grid_path + ".tmp", "wb") as file:
+            file.write(GRID_HEADER.pack(GRID_MAGIC, GRID_VERSION, width, len(rows), stamp[0], stamp[1]))
+            file.write(cells.tobytes())
+        os.replace(grid_path + ".tmp", grid_path)
+    except OSError:
+        pass
+    return rows
+
+
+def prepare_content():
+    "Convert the sheets to the pixel format of the display. This has to be done again whenever the display is recreated."
+    global SPRITE_SHEET
+    global TEXT_SHEET
+    global CONTENT_VERSION
+    global __glyphs
+    SPRITE_SHEET = __sprite_sheet_source.convert_alpha()
+    TEXT_SHEET = __text_sheet_source.convert_alpha()
+    CONTENT_VERSION += 1
+    __glyphs = None
+    __text_images.clear()
+    __sprite_images.clear()
+
+
+def __image_format(image):
+    total = image.get_width() * image.get_height()
+    opaque = pygame.mask.from_surface(image, 254).count()
+    if opaque == total:
+        return ImageFormat.OPAQUE
+
+    visible = pygame.mask.from_surface(image, 0).count()
+    key_in_use = pygame.mask.from_threshold(
+        image, COLOR_KEY + (255,), (1, 1, 1, 255)).count() > 0
+    if visible == opaque and not key_in_use:
+        return ImageFormat.COLOR_KEY
+
+    return ImageFormat.ALPHA
+
+
+def __convert_image(image, image_format):
+    if image_format == ImageFormat.OPAQUE:
+        return image.convert()
+
+    if image_format == ImageFormat.COLOR_KEY:
+        converted = pygame.Surface(image.get_size()).convert()
+        converted.fill(COLOR_KEY)
+        converted.blit(image, (0, 0))
+        converted.set_colorkey(COLOR_KEY, pygame.RLEACCEL)
+        return converted
+
+    return image.convert_alpha()
+
+
+def convert_image(image):
+    "Convert an image to the display format that suits its transparency best."
+    return __convert_image(image, __image_format(image))
+
+
+def sprite_image(sheet, x, y, width, height):
+    "Returns the image of a region of a sprite sheet. Every region is only copied out of its sheet once."
+    key = (sheet, x, y, width, height)
+    image = __sprite_images.get(key)
+    if image is None:
+        image = pygame.Surface((width, height), pygame.SRCALPHA)
+        image.blit(sheet, (0, 0), (x, y, width, height))
+        image = convert_image(image)
+        __sprite_images[key] = image
+    return image
+
+
+def __load_glyphs():
+    "Cut every glyph out of the TEXT_SHEET once."
+    global __glyphs
+    __glyphs = []
+    for i in range(GLYPH_COLUMNS * GLYPH_COLUMNS):
+        glyph = pygame.Surface((GLYPH_SIZE, GLYPH_SIZE), pygame.SRCALPHA)
+        glyph.blit(
+            TEXT_SHEET,
+            (0, 0),
+            (i % GLYPH_COLUMNS * GLYPH_SIZE, i // GLYPH_COLUMNS * GLYPH_SIZE, GLYPH_SIZE, GLYPH_SIZE)
+        )
+        __glyphs.append(glyph)
+
+
+def render_text(value):
+    "Returns a surface with the whole string on it. Surfaces are cached by string, so only new strings are composed."
+    image = __text_images.get(value)
+    if image is not None:
+        __text_images.move_to_end(value)
+        return image
+
+    if __glyphs is None:
+        __load_glyphs()
+
+    image = pygame.Surface(
+        ((len(value) - 1) * GLYPH_SPACING + GLYPH_SIZE if len(value) > 0 else 0, GLYPH_SIZE), pygame.SRCALPHA)
+    # Glyphs overlap, and each one is drawn on top of the glyph that follows it.
+    for i in range(len(value) - 1, -1, -1):
+        if ord(value[i]) < len(__glyphs):
+            image.blit(__glyphs[ord(value[i])], (i * GLYPH_SPACING, 0))
+    image = convert_image(image)
+
+    __text_images[value] = image
+    if len(__text_images) > TEXT_CACHE_LIMIT:
+        __text_images.popitem(last=False)
+
+    return image
+
+
 class SpriteType(IntEnum):
     NONE = 0
     PLAYER_F = 1
@@ -152,207 +375,22 @@ class Sprite(PygineObject):
         self.set_height(height)
 
     def _load_sprite(self):
-        if self.type == SpriteType.NONE:
-            self._sprite_setup(1023, 1023, 1, 1)
-
-        elif (self.type == SpriteType.PLAYER_F):
-            self._sprite_setup(0, 624, 16, 32)
-        elif (self.type == SpriteType.PLAYER_L):
-            self._sprite_setup(0, 720, 16, 32)
-        elif (self.type == SpriteType.PLAYER_B):
-            self._sprite_setup(0, 688, 16, 32)
-        elif (self.type == SpriteType.PLAYER_R):
-            self._sprite_setup(0, 656, 16, 32)
-        elif (self.type == SpriteType.PLAYER_ARM_SIDE_F):
-            self._sprite_setup(96, 624, 16, 32)
-        elif (self.type == SpriteType.PLAYER_ARM_SIDE_L):
-            self._sprite_setup(96, 720, 16, 32)
-        elif (self.type == SpriteType.PLAYER_ARM_SIDE_B):
-            self._sprite_setup(96, 688, 16, 32)
-        elif (self.type == SpriteType.PLAYER_ARM_SIDE_R):
-            self._sprite_setup(96, 656, 16, 32)
-        elif (self.type == SpriteType.PLAYER_ARM_ABOVE_F):
-            self._sprite_setup(192, 624, 16, 32)
-        elif (self.type == SpriteType.PLAYER_ARM_ABOVE_L):
-            self._sprite_setup(192, 720, 16, 32)
-        elif (self.type == SpriteType.PLAYER_ARM_ABOVE_B):
-            self._sprite_setup(192, 688, 16, 32)
-        elif (self.type == SpriteType.PLAYER_ARM_ABOVE_R):
-            self._sprite_setup(192, 656, 16, 32)
-
-        elif (self.type == SpriteType.PLAYER_SHADOW):
-            self._sprite_setup(96, 752, 16, 32)
-
-        elif (self.type == SpriteType.NPC_M_F):
-            self._sprite_setup(0, 752, 16, 32)
-        elif (self.type == SpriteType.NPC_M_L):
-            self._sprite_setup(0, 784, 16, 32)
-        elif (self.type == SpriteType.NPC_M_B):
-            self._sprite_setup(0, 816, 16, 32)
-        elif (self.type == SpriteType.NPC_M_R):
-            self._sprite_setup(0, 848, 16, 32)
-
-        elif (self.type == SpriteType.NPC_F_F):
-            self._sprite_setup(0, 880, 16, 32)
-        elif (self.type == SpriteType.NPC_F_L):
-            self._sprite_setup(0, 912, 16, 32)
-        elif (self.type == SpriteType.NPC_F_B):
-            self._sprite_setup(0, 944, 16, 32)
-        elif (self.type == SpriteType.NPC_F_R):
-            self._sprite_setup(0, 976, 16, 32)
-
-        elif (self.type == SpriteType.SPEECH_BUBBLE):
-            self._sprite_setup(112, 752, 32, 32)
-
-        elif (self.type == SpriteType.SIMPLE_HOUSE):
-            self._sprite_setup(0, 64, 48, 64)
-        elif (self.type == SpriteType.SIMPLE_HOUSE_SHADOW):
-            self._sprite_setup(0, 128, 48, 64)
-        elif (self.type == SpriteType.SPECIAL_HOUSE):
-            self._sprite_setup(48, 64, 80, 64)
-        elif (self.type == SpriteType.SPECIAL_HOUSE_SHADOW):
-            self._sprite_setup(48, 128, 80, 64)
-        elif (self.type == SpriteType.SHOP):
-            self._sprite_setup(128, 32, 80, 96)
-        elif (self.type == SpriteType.SHOP_SHADOW):
-            self._sprite_setup(128, 128, 80, 96)
-        elif (self.type == SpriteType.DINER):
-            self._sprite_setup(208, 64, 128, 64)
-        elif (self.type == SpriteType.DINER_SHADOW):
-            self._sprite_setup(208, 128, 128, 64)
-
-        elif (self.type == SpriteType.GRASS):
-            self._sprite_setup(0, 0, 32, 32)
-        elif (self.type == SpriteType.TREE_THING):
-            self._sprite_setup(336, 96, 32, 32)
-        elif (self.type == SpriteType.TREE_THING_SHADOW):
-            self._sprite_setup(336, 128, 32, 32)
-
-        elif (self.type == SpriteType.COFFEE_RAW):
-            self._sprite_setup(0, 592, 16, 16)
-        elif (self.type == SpriteType.COFFEE_PRO):
-            self._sprite_setup(0, 576, 16, 16)
-        elif (self.type == SpriteType.FISH_RAW):
-            self._sprite_setup(16, 592, 16, 16)
-        elif (self.type == SpriteType.FISH_PRO):
-            self._sprite_setup(16, 576, 16, 16)
-        elif (self.type == SpriteType.CROP_RAW):
-            self._sprite_setup(32, 592, 16, 16)
-        elif (self.type == SpriteType.CROP_PRO):
-            self._sprite_setup(32, 576, 16, 16)
-        elif (self.type == SpriteType.EGGS_RAW):
-            self._sprite_setup(48, 592, 16, 16)
-        elif (self.type == SpriteType.EGGS_PRO):
-            self._sprite_setup(48, 576, 16, 16)
-
-        elif (self.type == SpriteType.SIMPLE_HOUSE_INSIDE):
-            self._sprite_setup(0, 224, 160, 160)
-        elif (self.type == SpriteType.SPECIAL_HOUSE_INSIDE):
-            self._sprite_setup(160, 224, 288, 160)
-        elif (self.type == SpriteType.SHOP_INSIDE):
-            self._sprite_setup(448, 224, 288, 160)
-        elif (self.type == SpriteType.DINER_INSIDE):
-            self._sprite_setup(736, 224, 288, 160)
-
-        elif (self.type == SpriteType.FLOWER_POT):
-            self._sprite_setup(0, 416, 16, 48)
-        elif (self.type == SpriteType.SOFA):
-            self._sprite_setup(16, 432, 64, 32)
-        elif (self.type == SpriteType.BED):
-            self._sprite_setup(80, 400, 32, 64)
-        elif (self.type == SpriteType.SHELF_EMPTY):
-            self._sprite_setup(112, 400, 32, 64)
-        elif (self.type == SpriteType.SHELF_FULL):
-            self._sprite_setup(144, 400, 32, 64)
-        elif (self.type == SpriteType.SHOP_COUNTER):
-            self._sprite_setup(176, 416, 112, 48)
-        elif (self.type == SpriteType.STOOL_TALL):
-            self._sprite_setup(288, 432, 16, 32)
-        elif (self.type == SpriteType.STOOL_SHORT):
-            self._sprite_setup(304, 432, 16, 32)
-        elif (self.type == SpriteType.TABLE):
-            self._sprite_setup(320, 432, 32, 32)
-        elif (self.type == SpriteType.SHELF_EMPTY):
-            self._sprite_setup(352, 432, 32, 16)
-        elif (self.type == SpriteType.DINER_COUNTER):
-            self._sprite_setup(0, 480, 256, 80)
-
-        elif (self.type == SpriteType.OCTOPUS):
-            self._sprite_setup(112, 784, 16 * 3, 16 * 3)
-        elif (self.type == SpriteType.INK_BULLET):
-            self._sprite_setup(160, 800, 16, 16)
-        elif (self.type == SpriteType.BOAT):
-            self._sprite_setup(112, 880, 16 * 7, 16 * 5)
-        elif (self.type == SpriteType.WAVE):
-            self._sprite_setup(176, 880, 16, 16)
-        elif (self.type == SpriteType.ROCK):
-            self._sprite_setup(176, 784, 16 * 3, 16 * 2)
-
-        elif (self.type == SpriteType.BOAT_OWO):
-            self._sprite_setup(240, 944, 16 * 7, 16 * 5)
-
-        elif (self.type == SpriteType.SIDEWALK_LONG):
-            self._sprite_setup(32, 0, 608, 32)
-        elif (self.type == SpriteType.SIDEWALK_TALL):
-            self._sprite_setup(976, 736, 32, 272)
-        elif (self.type == SpriteType.TREE_CLUSTER):
-            self._sprite_setup(368, 80, 64, 48)
-
-        elif (self.type == SpriteType.OCTOPUS_SHADOW):
-            self._sprite_setup(112, 832, 48, 48)
-        elif (self.type == SpriteType.INK_BULLET_SHADOW):
-            self._sprite_setup(160, 816, 16, 16)
-        elif (self.type == SpriteType.BOAT_SHADOW):
-            self._sprite_setup(112, 960, 112, 48)
-        elif (self.type == SpriteType.ROCK_SHADOW):
-            self._sprite_setup(176, 816, 48, 32)
-
-        elif (self.type == SpriteType.BEACH):
-            self._sprite_setup(656, 624, 320, 240)
-
-        elif (self.type == SpriteType.HOOK):
-            self._sprite_setup(352, 816, 16, 32)
-        elif (self.type == SpriteType.FISH_SMALL_R):
-            self._sprite_setup(384, 848, 32, 16)
-        elif (self.type == SpriteType.FISH_SMALL_L):
-            self._sprite_setup(352, 848, 32, 16)
-        elif (self.type == SpriteType.FISH_LARGE_R):
-            self._sprite_setup(384, 864, 32, 16)
-        elif (self.type == SpriteType.FISH_LARGE_L):
-            self._sprite_setup(352, 864, 32, 16)
-        elif (self.type == SpriteType.ROCK_WALL_R):
-            self._sprite_setup(384, 880, 32, 64)
-        elif (self.type == SpriteType.ROCK_WALL_L):
-            self._sprite_setup(352, 880, 32, 64)
-
-        elif (self.type == SpriteType.FACE_HAPPY):
-            self._sprite_setup(144, 752, 16, 16)
-        elif (self.type == SpriteType.FACE_SAD):
-            self._sprite_setup(144 + 16, 752, 16, 16)
-        elif (self.type == SpriteType.FACE_MAD):
-            self._sprite_setup(144, 752 + 16, 16, 16)
-        elif (self.type == SpriteType.FACE_SURPRISED):
-            self._sprite_setup(144 + 16, 752 + 16, 16, 16)
-
-        elif (self.type == SpriteType.SAND_WALL):
-            self._sprite_setup(432, 880, 64, 32)
-
-        elif (self.type == SpriteType.TEXT):
-            self._sprite_setup(0, 0, 19, 19)
-
+        self._sprite_setup(*SPRITE_REGIONS[self.type])
         self.__apply_changes_to_sprite()
 
     def __apply_changes_to_sprite(self):
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-
-        if self.type == SpriteType.TEXT:
-            self.image.blit(TEXT_SHEET, (0, 0),
-                            (self.__sprite_x, self.__sprite_y, self.width, self.height))
-        else:
-            self.image.blit(SPRITE_SHEET, (0, 0),
-                            (self.__sprite_x, self.__sprite_y, self.width, self.height))
+        self.__content_version = CONTENT_VERSION
+        self.image = sprite_image(
+            TEXT_SHEET if self.type == SpriteType.TEXT else SPRITE_SHEET,
+            self.__sprite_x,
+            self.__sprite_y,
+            self.width,
+            self.height
+        )
 
     def draw(self, surface, camera_type):
+        if self.__content_version != CONTENT_VERSION:
+            self.__apply_changes_to_sprite()
         draw_image(surface, self.image, self.bounds, camera_type)
 
 
@@ -376,24 +414,114 @@ class Animation:
 
 class Text(PygineObject):
     def __init__(self, x, y, value):
-        super(Text, self).__init__(x, y, 15, 15)
+        super(Text, self).__init__(x, y, GLYPH_SPACING, GLYPH_SPACING)
 
         self.value = value
         self.set_value(self.value)
 
+    def set_location(self, x, y):
+        super(Text, self).set_location(x, y)
+        self.__image_bounds = Rect(
+            self.x, self.y, self.image.get_width(), self.image.get_height())
+
     def set_value(self, value):
         self.value = value
+        self.__content_version = CONTENT_VERSION
+        self.image = render_text(self.value)
+        self.__image_bounds = Rect(
+            self.x, self.y, self.image.get_width(), self.image.get_height())
 
-        self.sprites = []
-        for i in range(len(self.value)):
-            self.sprites.append(
-                Sprite(self.x + i * self.width, self.y, SpriteType.TEXT))
+    def draw(self, surface, camera_type):
+        if self.__content_version != CONTENT_VERSION:
+            self.set_value(self.value)
+        if len(self.value) > 0:
+            draw_image(surface, self.image, self.__image_bounds, camera_type)
 
-        for i in range(len(self.value)):
-            self.sprites[i].set_frame(ord(list(self.value)[i]), 16)
 
-        self.sprites.sort(key=lambda e: -e.x)
+class TileMap(PygineObject):
+    "A grid of tiles that is drawn in cached chunks instead of one sprite per tile."
+    EMPTY = -1
+    CHUNK_SIZE = 8
 
-    def draw(self, surface, camera_type):
-        for s in self.sprites:
-            s.draw(surface, camera_type)
+    def __init__(self, x, y, columns, rows, tile_width, tile_height, tile_types):
+        super(TileMap, self).__init__(
+            x, y, columns * tile_width, rows * tile_height)
+        self.columns = columns
+        self.rows = rows
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.tile_types = tile_types
+        # Every tile is an index into tile_types, or EMPTY.
+        self.tiles = array("h", [TileMap.EMPTY]) * (self.columns * self.rows)
+        self.__tile_images = None
+        self.__chunks = {}
+        self.__content_version = CONTENT_VERSION
+
+    def set_location(self, x, y):
+        super(TileMap, self).set_location(x, y)
+        self.__chunks = {}
+
+    def get_tile(self, column, row):
+        return self.tiles[row * self.columns + column]
+
+    def set_tile(self, column, row, tile):
+        self.tiles[row * self.columns + column] = tile
+        self.__chunks.pop(
+            (column // TileMap.CHUNK_SIZE, row // TileMap.CHUNK_SIZE), None)
+
+    def fill(self, tile):
+        for i in range(len(self.tiles)):
+            self.tiles[i] = tile
+        self.__chunks = {}
+
+    def __chunk_bounds(self, chunk_x, chunk_y):
+        column = chunk_x * TileMap.CHUNK_SIZE
+        row = chunk_y * TileMap.CHUNK_SIZE
+        return Rect(
+            self.x + column * self.tile_width,
+            self.y + row * self.tile_height,
+            min(TileMap.CHUNK_SIZE, self.columns - column) * self.tile_width,
+            min(TileMap.CHUNK_SIZE, self.rows - row) * self.tile_height
+        )
+
+    def __build_chunk(self, chunk_x, chunk_y):
+        if self.__tile_images is None:
+            self.__tile_images = [
+                Sprite(0, 0, t).image for t in self.tile_types]
+
+        bounds = self.__chunk_bounds(chunk_x, chunk_y)
+        chunk = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        for row in range(bounds.height // self.tile_height):
+            for column in range(bounds.width // self.tile_width):
+                tile = self.get_tile(
+                    chunk_x * TileMap.CHUNK_SIZE + column,
+                    chunk_y * TileMap.CHUNK_SIZE + row
+                )
+                if tile != TileMap.EMPTY:
+                    chunk.blit(
+                        self.__tile_images[tile],
+                        (column * self.tile_width, row * self.tile_height)
+                    )
+        chunk = convert_image(chunk)
+
+        self.__chunks[(chunk_x, chunk_y)] = (chunk, bounds)
+        return self.__chunks[(chunk_x, chunk_y)]
+
+    def draw(self, surface, camera_type, viewport):
+        if self.__content_version != CONTENT_VERSION:
+            self.__content_version = CONTENT_VERSION
+            self.__tile_images = None
+            self.__chunks = {}
+
+        visible = viewport.clip(self.bounds)
+        if visible.width == 0 or visible.height == 0:
+            return
+
+        chunk_width = TileMap.CHUNK_SIZE * self.tile_width
+        chunk_height = TileMap.CHUNK_SIZE * self.tile_height
+        for chunk_y in range((visible.top - self.y) // chunk_height, (visible.bottom - 1 - self.y) // chunk_height + 1):
+            for chunk_x in range((visible.left - self.x) // chunk_width, (visible.right - 1 - self.x) // chunk_width + 1):
+                chunk = self.__chunks.get((chunk_x, chunk_y))
+                if chunk is None:
+                    chunk = self.__build_chunk(chunk_x, chunk_y)
+                draw_image(surface, chunk[0], chunk[1], camera_type)
@@ -1,7 +1,10 @@
 import pygame
 import pygine.globals
-from pygine.resource import load_content
+from pygine import profiler
+from pygine.draw import changed_draw_call_areas, clear_scaled_image_cache, replay_draw_calls, start_recording_draw_calls, stop_recording_draw_calls
+from pygine.resource import load_content, prepare_content
 from pygine.scenes import *
+from pygine.transitions import clear_transition_frames
 from pygine.utilities import Color, Input, InputType, StaticCamera
 from enum import IntEnum
 
@@ -19,9 +22,12 @@ class Orientaion(IntEnum):
 class Game:
     "A modest game engine used to streamline the development of a game made using pygame"
     state = GameState.QUIT
+    # Above this fraction of the screen a dirty frame is simply redrawn in full.
+    DIRTY_AREA_LIMIT = 0.5
 
     def __init__(self):
         self.__initialize_pygame()
+        profiler.mark("pygame.init")
 
         self.__setup_window(
             320 * 2, 240 * 2,
@@ -30,10 +36,13 @@ class Game:
             Orientaion.LANDSCAPE,
             "Diner Mafia"
         )
-        self.__setup_pixel_scene(320, 240)
+        self.__setup_pixel_scene(320, 240, True)
         self.__setup_cameras()
+        self.__setup_dirty_rectangles(pygine.globals.on_cpi)
+        profiler.mark("display setup")
 
         load_content()
+        profiler.mark("load_content")
 
         Game.state = GameState.RUNNING
         self.clock = pygame.time.Clock()
@@ -41,6 +50,7 @@ class Game:
         self.ticks = 0
         self.scene_manager = SceneManager()
         self.input = Input()
+        profiler.mark("scene construction")
 
     def __initialize_pygame(self):
         pygame.init()
@@ -70,9 +80,13 @@ class Game:
 
         pygame.display.set_caption(title)
 
-    def __setup_pixel_scene(self, game_width=320, game_height=180):
+    def __setup_pixel_scene(self, game_width=320, game_height=180, render_natively=False):
         self.game_width = game_width
         self.game_height = game_height
+        # When rendering natively the scene is drawn at the logical resolution and upscaled once per frame.
+        self.render_natively = render_natively
+        if self.render_natively:
+            self.pixel_scene = pygame.Surface((self.game_width, self.game_height))
 
     def __setup_cameras(self):
         if self.orientation == Orientaion.LANDSCAPE:
@@ -95,23 +109,44 @@ class Game:
                 if self.game_height * self.scale > self.window_height:
                     self.scale = self.window_height / self.game_height
 
+        if self.fullscreen:
+            horizontal_letterbox = (self.display_width - self.game_width * self.scale) / 2
+            vertical_letterbox = (self.display_height - self.game_height * self.scale) / 2
+        else:
+            horizontal_letterbox = (self.window_width - self.game_width * self.scale) / 2
+            vertical_letterbox = (self.window_height - self.game_height * self.scale) / 2
+
+        if self.render_natively:
+            self.static_camera = StaticCamera(
+                (self.game_width, self.game_height), 1)
+            self.__setup_pixel_scene_destination(
+                horizontal_letterbox, vertical_letterbox)
+            return
+
         self.static_camera = StaticCamera(
             (self.game_width, self.game_height), self.scale)
 
-        if self.fullscreen:
-            if self.game_width * self.scale < self.display_width:
-                self.static_camera.apply_horizontal_letterbox(
-                    (self.display_width - self.game_width * self.scale) / 2)
-            if self.game_height * self.scale < self.display_height:
-                self.static_camera.apply_vertical_letterbox(
-                    (self.display_height - self.game_height * self.scale) / 2)
-        else:
-            if self.game_width * self.scale < self.window_width:
-                self.static_camera.apply_horizontal_letterbox(
-                    (self.window_width - self.game_width * self.scale) / 2)
-            if self.game_height * self.scale < self.window_height:
-                self.static_camera.apply_vertical_letterbox(
-                    (self.window_height - self.game_height * self.scale) / 2)
+        if horizontal_letterbox > 0:
+            self.static_camera.apply_horizontal_letterbox(horizontal_letterbox)
+        if vertical_letterbox > 0:
+            self.static_camera.apply_vertical_letterbox(vertical_letterbox)
+
+    def __setup_pixel_scene_destination(self, horizontal_letterbox, vertical_letterbox):
+        "Reserve the part of the window the pixel scene is upscaled into, and black out the letterboxes."
+        self.__clear_screen(Color.BLACK)
+        self.pixel_scene_destination = self.window.subsurface(
+            pygame.Rect(
+                int(horizontal_letterbox),
+                int(vertical_letterbox),
+                int(self.game_width * self.scale),
+                int(self.game_height * self.scale)
+            )
+        )
+
+    def __setup_dirty_rectangles(self, enabled=False):
+        # When enabled only the parts of the screen that changed since the last frame are redrawn and presented.
+        self.dirty_rectangles = enabled
+        self.__previous_draw_calls = None
 
     def __quit_game(self):
         Game.state = GameState.QUIT
@@ -126,6 +161,10 @@ class Game:
                 (self.window_width, self.window_height))
 
         self.__setup_cameras()
+        prepare_content()
+        clear_scaled_image_cache()
+        clear_transition_frames()
+        self.__previous_draw_calls = None
 
     def __calculate_delta_time(self):
         self.clock.tick(self.target_fps)
@@ -157,18 +196,115 @@ class Game:
         self.scene_manager.update(self.delta_time)
         self.__update_events()
 
+    def __scene_region(self, surface):
+        if self.render_natively:
+            return surface.get_rect()
+        return pygame.Rect(
+            StaticCamera.horizontal_letterbox,
+            StaticCamera.vertical_letterbox,
+            self.game_width * self.scale,
+            self.game_height * self.scale
+        )
+
+    def __find_dirty_areas(self, draw_calls, region):
+        "Returns the merged areas touched by draw calls that differ from the last frame, or None to redraw everything."
+        if self.__previous_draw_calls is None:
+            return None
+
+        areas = []
+        for area in changed_draw_call_areas(self.__previous_draw_calls, draw_calls):
+            area = region.clip(area)
+            if area.width == 0 or area.height == 0:
+                continue
+            i = area.collidelist(areas)
+            while i != -1:
+                area.union_ip(areas.pop(i))
+                i = area.collidelist(areas)
+            areas.append(area)
+
+        if sum(a.width * a.height for a in areas) > region.width * region.height * Game.DIRTY_AREA_LIMIT:
+            return None
+
+        return areas
+
+    def __draw_scene(self, surface):
+        "Draw the current scene onto the surface. Returns the areas that changed, or None if everything was redrawn."
+        if Game.state == GameState.QUIT or not self.dirty_rectangles:
+            surface.fill(Color.BLACK)
+            if Game.state != GameState.QUIT:
+                self.scene_manager.draw(surface)
+            return None
+
+        start_recording_draw_calls(surface)
+        self.scene_manager.draw(surface)
+        draw_calls = stop_recording_draw_calls()
+
+        region = self.__scene_region(surface)
+        areas = self.__find_dirty_areas(draw_calls, region)
+        self.__previous_draw_calls = draw_calls
+
+        if areas is None:
+            surface.fill(Color.BLACK)
+            replay_draw_calls(surface, draw_calls)
+        else:
+            for area in areas:
+                # Fill respects the clip, so it has to be set to this area before the area is cleared.
+                surface.set_clip(area)
+                surface.fill(Color.BLACK, area)
+                replay_draw_calls(surface, draw_calls, area)
+            surface.set_clip(None)
+
+        return areas
+
+    def __draw_natively(self):
+        areas = self.__draw_scene(self.pixel_scene)
+
+        # pygame.transform.scale samples the nearest pixel, so the pixel art stays crisp at any window size.
+        if areas is None or not float(self.scale).is_integer():
+            pygame.transform.scale(
+                self.pixel_scene,
+                self.pixel_scene_destination.get_size(),
+                self.pixel_scene_destination
+            )
+        else:
+            for area in areas:
+                destination = pygame.Rect(
+                    area.x * self.scale, area.y * self.scale, area.width * self.scale, area.height * self.scale)
+                pygame.transform.scale(
+                    self.pixel_scene.subsurface(area),
+                    destination.size,
+                    self.pixel_scene_destination.subsurface(destination)
+                )
+
+        if areas is None:
+            return None
+
+        offset = self.pixel_scene_destination.get_abs_offset()
+        return [
+            pygame.Rect(
+                a.x * self.scale, a.y * self.scale, a.width * self.scale, a.height * self.scale
+            ).move(offset)
+            for a in areas
+        ]
+
     def __draw(self):
-        if Game.state == GameState.QUIT:
-            self.__clear_screen(Color.BLACK)
+        if self.render_natively:
+            areas = self.__draw_natively()
         else:
-            self.__clear_screen(Color.BLACK)
-            self.scene_manager.draw(self.window)
+            areas = self.__draw_scene(self.window)
+            if areas is None:
+                self.static_camera.draw(self.window)
 
-        self.static_camera.draw(self.window)
-        pygame.display.update()
+        if areas is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(areas)
 
     def run(self):
         while Game.state != GameState.QUIT:
             self.__update()
             self.__draw()
+            if profiler.enabled:
+                profiler.mark("first frame")
+                profiler.report()
         pygame.quit()
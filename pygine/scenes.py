@@ -1,11 +1,17 @@
+import math
+import pygame
+import pygine.resource
 from enum import IntEnum
-from random import randint, random, seed
+from random import getstate, random, seed, setstate
 from pygame import Rect
+from pygine.draw import draw_surface, start_recording_draw_calls, stop_recording_draw_calls, submit_draw_calls
 from pygine.entities import *
-from pygine.maths import Vector2
-from pygine.resource import Text
-from pygine.sounds import play_song
-from pygine.transitions import Pinhole, TransitionType
+from pygine.maths import Vector2, merge_cells
+from pygine.resource import Text, TileMap, load_grid
+from pygine.snapshot import Snapshot
+from pygine.sounds import SONG_FADE_MS, fade_out_song, play_song, prefetch_song, stop_fading_song
+from pygine.spatial import Proximity, SpatialHash, StaticIndex
+from pygine.transitions import TransitionType, create_transition
 from pygine.triggers import *
 from pygine.utilities import Camera, Input, InputType
 
@@ -26,53 +32,103 @@ class SceneType(IntEnum):
 
 
 class SceneManager:
-    def __init__(self):
+    def __init__(self, preload_scenes=False):
         self.input = Input()
+        # Scenes are built the first time they are needed. With preload_scenes, the rest are built one per frame
+        # while no transition is running.
+        self.preload_scenes = preload_scenes
+        self.__initialize_scenes()
         self.__reset()
 
     def get_scene(self, scene_type):
-        return self.__all_scenes[int(scene_type)]
+        scene = self.__all_scenes[int(scene_type)]
+        if scene is None:
+            scene = self.__create_scene(scene_type)
+            self.__add_scene(scene_type, scene)
+        return scene
 
     def get_current_scene(self):
         return self.__current_scene
 
     def __reset(self):
-        self.__all_scenes = []
         self.__current_scene = None
         self.__previous_scene = None
         self.__next_scene = None
         self.leave_transition = None
         self.enter_transition = None
         self.start_transition = False
-
-        self.__initialize_scenes()
+        self.__prefetch = None
+        self.__next_scene_prefetched = True
+        self.__song_pending = False
+
+        if self.__random_state is not None:
+            setstate(self.__random_state)
+        Entity.moved.clear()
+        Entity.removed.clear()
+        for snapshot in self.__snapshots:
+            if snapshot is not None:
+                snapshot.restore()
+        for scene in self.__all_scenes:
+            if scene is not None:
+                scene.update_ui()
         self.__set_starting_scene(SceneType.VILLAGE)
 
-    def __add_scene(self, scene):
-        self.__all_scenes.append(scene)
+    def __create_scene(self, scene_type):
+        if scene_type == SceneType.VILLAGE:
+            return Village()
+        if scene_type == SceneType.FOREST:
+            return Forest()
+        if scene_type == SceneType.FARM:
+            return Farm()
+        if scene_type == SceneType.OCEAN:
+            return Ocean()
+        if scene_type == SceneType.ROOM_SIMPLE:
+            return RoomSimple()
+        if scene_type == SceneType.ROOM_SPECIAL:
+            return RoomSpecial()
+        if scene_type == SceneType.SHOP:
+            return ShopScene()
+        if scene_type == SceneType.DINER:
+            return DinerScene()
+
+        # Most sessions never start a minigame, so their module is only imported once one is needed.
+        from pygine.minigames import CoffeeMinigame, CropMinigame, EggsMinigame, FishMinigame
+        if scene_type == SceneType.COFFEE_MINIGAME:
+            return CoffeeMinigame()
+        if scene_type == SceneType.CROP_MINIGAME:
+            return CropMinigame()
+        if scene_type == SceneType.FISH_MINIGAME:
+            return FishMinigame()
+        if scene_type == SceneType.EGGS_MINIGAME:
+            return EggsMinigame()
+        raise ValueError("Unknown scene type {}".format(scene_type))
+
+    def __add_scene(self, scene_type, scene):
+        self.__all_scenes[int(scene_type)] = scene
         scene.manager = self
+        self.__snapshots[int(scene_type)] = Snapshot(scene, ignore=(self,))
+        self.__random_state = getstate()
 
     def __initialize_scenes(self):
-        # Scenes must be added in the same order as declared in the IntEnum
-        self.__all_scenes = []
-        self.__add_scene(Village())
-        self.__add_scene(Forest())
-        self.__add_scene(Farm())
-        self.__add_scene(Ocean())
-        self.__add_scene(RoomSimple())
-        self.__add_scene(RoomSpecial())
-        self.__add_scene(ShopScene())
-        self.__add_scene(DinerScene())
-        self.__add_scene(CoffeeMinigame())
-        self.__add_scene(CropMinigame())
-        self.__add_scene(FishMinigame())
-        self.__add_scene(EggsMinigame())
+        # Every SceneType gets a slot, the scene itself is only built by get_scene
+        self.__all_scenes = [None] * len(SceneType)
+        # Reset puts every scene that was built back the way it was built, and the random numbers back to where they
+        # were right after the last of those scenes was built.
+        self.__snapshots = [None] * len(SceneType)
+        self.__random_state = None
+
+    def __preload_scene(self):
+        for scene_type in SceneType:
+            if self.__all_scenes[int(scene_type)] is None:
+                self.get_scene(scene_type)
+                return
 
     def __set_starting_scene(self, starting_scene_type):
         assert (len(self.__all_scenes) > 0), \
             "It looks like you never initialized all the scenes! Make sure to setup and call __initialize_scenes()"
 
-        self.__current_scene = self.__all_scenes[int(starting_scene_type)]
+        self.__current_scene = self.get_scene(starting_scene_type)
+        stop_fading_song()
         play_song(self.__current_scene.song)
         self.__current_scene.relay_player(
             Player(
@@ -82,26 +138,49 @@ class SceneManager:
         )
 
     def __setup_transition(self):
-        if self.__previous_scene.leave_transition_type == TransitionType.PINHOLE_CLOSE:
-            self.leave_transition = Pinhole(TransitionType.PINHOLE_CLOSE)
-
-        if self.__next_scene.enter_transition_type == TransitionType.PINHOLE_OPEN:
-            self.enter_transition = Pinhole(TransitionType.PINHOLE_OPEN)
+        self.leave_transition = create_transition(
+            self.__previous_scene.leave_transition_type)
+        self.enter_transition = create_transition(
+            self.__next_scene.enter_transition_type)
 
         self.start_transition = True
 
-    def queue_next_scene(self, scene_type, end_location):
+    def queue_next_scene(self, scene_type, end_location, start_game=False):
         self.__end_location = end_location
         self.__previous_scene = self.__current_scene
-        self.__next_scene = self.__all_scenes[int(scene_type)]
+        self.__next_scene = self.get_scene(scene_type)
         self.__setup_transition()
+        self.__next_scene_prefetched = False
+        self.__prefetch = self.__prefetch_next_scene(start_game)
+        # The song fades out over the leave transition, so it is quiet by the time the next one has to start.
+        fade_out_song(self.__next_scene.song, int(self.leave_transition.duration() * 1000))
+
+    def __prefetch_next_scene(self, start_game):
+        "Get the next scene ready one step at a time, while the leave transition hides it."
+        if start_game:
+            self.__next_scene.start_game()
+            yield
+        for _ in self.__next_scene.prefetch():
+            yield
+        self.__next_scene_prefetched = True
+        for _ in prefetch_song(self.__next_scene.song):
+            yield
 
     def __change_scenes(self):
+        # Whatever the leave transition did not have time for is done now. Reading the song ahead is only worth it
+        # while there is time to spare, so whatever is left of it is dropped.
+        while not self.__next_scene_prefetched:
+            next(self.__prefetch)
+        if self.__prefetch is not None:
+            self.__prefetch.close()
+            self.__prefetch = None
         self.__current_scene.player.set_location(
             self.__end_location.x, self.__end_location.y)
         self.__current_scene = self.__next_scene
+        # The scene was sorted while it was prefetched, and is not updated until the enter transition is done.
+        self.__current_scene._sort_entities()
         if self.__current_scene.song != "":
-            play_song(self.__current_scene.song)
+            self.__song_pending = not play_song(self.__current_scene.song, SONG_FADE_MS)
         self.__current_scene.update_ui()
 
     def __update_input(self, delta_time):
@@ -115,6 +194,8 @@ class SceneManager:
             if self.leave_transition.done:
                 self.enter_transition.update(delta_time)
                 self.__change_scenes()
+            elif self.__prefetch is not None:
+                next(self.__prefetch, None)
         else:
             self.start_transition = False
 
@@ -124,17 +205,21 @@ class SceneManager:
 
         self.__update_input(delta_time)
         self.__update_transition(delta_time)
+        if self.__song_pending and not self.start_transition:
+            self.__song_pending = not play_song(self.__current_scene.song, SONG_FADE_MS)
         if not self.start_transition:
             self.__current_scene.update(delta_time)
         else:
             self.__current_scene.update_camera()
 
+        if self.preload_scenes and not self.start_transition:
+            self.__preload_scene()
+
     def __draw_transitions(self, surface):
+        # Only one transition is ever on screen, the enter transition takes over once the leave transition is done.
         if self.start_transition:
-            if self.leave_transition != None and not self.leave_transition.done:
+            if not self.leave_transition.done:
                 self.leave_transition.draw(surface)
-                if self.leave_transition.done:
-                    self.enter_transition.draw(surface)
             else:
                 self.enter_transition.draw(surface)
 
@@ -148,6 +233,9 @@ class SceneManager:
 
 class Scene(object):
     VIEWPORT_BUFFER = 32
+    STATIC_LAYER_LIMIT = 16 * 1024 * 1024
+    # The scene that last consumed Entity.moved.
+    __depth_sorting_scene = None
 
     def __init__(self):
         self.camera = Camera()
@@ -157,6 +245,7 @@ class Scene(object):
             -Scene.VIEWPORT_BUFFER, -Scene.VIEWPORT_BUFFER, Camera.BOUNDS.width + Scene.VIEWPORT_BUFFER * 2,
                                                             Camera.BOUNDS.height + Scene.VIEWPORT_BUFFER * 2, Color.RED,
             2)
+        self.tilemaps = []
         self.sprites = []
         self.entities = []
         self.shapes = []
@@ -171,10 +260,34 @@ class Scene(object):
 
         # to be set by respective classes
         self.song = ""
+        self.show_money = True
 
         self.money_ui = Text(8 + 16 + 4, 8, str(pygine.globals.money))
         self.dollar_sign = Text(8, 8, "$")
 
+        self.__static_layer = None
+        self.__static_layer_origin = Vector2(0, 0)
+        self.__static_layer_source = None
+
+        self.__depth_keys = {}
+        self.__depth_keys_source = None
+
+        # Static entities are indexed once, every other entity is hashed on 16px cells, the size of a Wall tile.
+        self.static_index = StaticIndex([])
+        self.spatial_hash = SpatialHash(16)
+        # NPCs register their conversation radius, so they hear when the player walks up to them or away.
+        self.proximity = Proximity(self.spatial_hash)
+        self.dynamic_entities = []
+        self.__synced_entities = None
+        self.__synced_entity_set = set()
+        self.__visible_entities = set()
+        # Triggers are hashed on the same cells as the entities, and only checked when the player can set them off.
+        self.__trigger_hash = SpatialHash(16)
+        self.__trigger_order = {}
+        self.__indexed_triggers = None
+        self.__indexed_trigger_count = 0
+        self.__trigger_player_location = None
+
     def _reset(self):
         raise NotImplementedError(
             "A class that inherits Scene did not implement the reset() method")
@@ -186,6 +299,7 @@ class Scene(object):
     def relay_player(self, player):
         self.player = player
         self.entities.append(self.player)
+        self.__trigger_player_location = None
 
     def relay_entity(self, entity):
         self.entities.append(entity)
@@ -198,23 +312,139 @@ class Scene(object):
             return 1000 * (e.sprite.y + e.sprite.height) - e.sprite.x
 
     def _sort_entities(self):
-        self.entities.sort(key=self._sort_key)
+        "Keep the entities in depth order. Sort keys are cached, and only entities that moved get a new one."
+        resort = False
+        if self.__depth_keys_source is not self.entities or Scene.__depth_sorting_scene is not self:
+            # Moves made while another scene was sorting were never seen here, so start over.
+            self.__depth_keys = {}
+            self.__depth_keys_source = self.entities
+            Scene.__depth_sorting_scene = self
+            Entity.moved.clear()
+
+        keys = self.__depth_keys
+        for e in Entity.moved:
+            key = keys.get(e)
+            if key is not None:
+                new_key = self._sort_key(e)
+                if new_key != key:
+                    keys[e] = new_key
+                    resort = True
+        Entity.moved.clear()
+
+        # Entities are added and removed all over the place, and the list is sorted in place, so what is in it is
+        # compared as a whole rather than by what is at the end.
+        if keys.keys() != set(self.entities):
+            keys = {e: keys[e] if e in keys else self._sort_key(e)
+                    for e in self.entities}
+            self.__depth_keys = keys
+            resort = True
+
+        # Static entities keep their place, so the sort only has to move the few entities that changed.
+        if resort:
+            self.entities.sort(key=keys.__getitem__)
+
+    def __sync_entities(self):
+        "Split the entities into the static index and the dynamic entities, if entities were added or removed."
+        # Entities are added and removed all over the place, and can move to another scene and back, so what is in the
+        # list is compared as a whole, and every dynamic entity still has to be hashed here.
+        entity_set = set(self.entities)
+        if (
+            self.__synced_entities is self.entities and
+            self.__synced_entity_set == entity_set and
+            all(e.spatial_hash is self.spatial_hash for e in self.dynamic_entities)
+        ):
+            return
+
+        static_entities = [e for e in self.entities if e.static]
+        if self.__synced_entities is not self.entities or len(static_entities) != len(self.static_index.objects):
+            self.static_index = StaticIndex(static_entities)
+
+        self.dynamic_entities = [e for e in self.entities if not e.static]
+        self.spatial_hash.sync(self.dynamic_entities)
+        self.proximity.sync(
+            {e: e.radius for e in self.dynamic_entities if isinstance(e, NPC)})
+        for e in self.dynamic_entities:
+            e.ignore = True
+            if e.remove:
+                Entity.removed.add(e)
+            if isinstance(e, Kinetic):
+                e.static_colliders = self.static_index
+        self.__visible_entities = set()
+
+        self.__synced_entities = self.entities
+        self.__synced_entity_set = entity_set
+
+    def __depth_key(self, e):
+        key = self.__depth_keys.get(e)
+        return key if key is not None else self._sort_key(e)
+
+    def __update_visible_entities(self):
+        "Find the dynamic entities in the viewport, and set the ignore flag of the ones that entered or left it."
+        visible = self.spatial_hash.query(self.camera_viewport.bounds)
+        visible_set = set(visible)
+        for e in self.__visible_entities:
+            if e not in visible_set:
+                e.ignore = True
+        for e in visible:
+            if e not in self.__visible_entities:
+                e.ignore = False
+        self.__visible_entities = visible_set
+        return visible
+
+    def __remove_entities(self):
+        for e in list(Entity.removed):
+            if e.spatial_hash is None:
+                # Not in any scene anymore, or not synced yet. Scenes pick up flagged entities when they sync.
+                Entity.removed.discard(e)
+            elif e.spatial_hash is self.spatial_hash:
+                Entity.removed.discard(e)
+                self.spatial_hash.remove(e)
+                self.__visible_entities.discard(e)
+                self.dynamic_entities.remove(e)
+                self.__synced_entity_set.discard(e)
+                if e in self.entities:
+                    self.entities.remove(e)
 
     def __update_entities(self, delta_time):
-        for i in range(len(self.entities) - 1, -1, -1):
-            if self.entities[i].bounds.colliderect(self.camera_viewport.bounds):
-                self.entities[i].ignore = False
-                self.entities[i].update(delta_time, self.entities)
-            else:
-                self.entities[i].ignore = True
-            if self.entities[i].remove:
-                del self.entities[i]
+        self.__sync_entities()
+        # Static entities do nothing in update, and entities outside of the viewport are not updated, so only the
+        # dynamic entities in the viewport are looked at. They are updated from front to back.
+        visible = self.__update_visible_entities()
+        visible.sort(key=self.__depth_key, reverse=True)
+        for e in visible:
+            e.update(delta_time, self.entities)
+        self.__remove_entities()
+        if self.player is not None and self.player.spatial_hash is self.spatial_hash:
+            self.proximity.update(self.player, self.entities)
         self._sort_entities()
 
+    def __sync_triggers(self):
+        if self.__indexed_triggers is self.triggers and self.__indexed_trigger_count == len(self.triggers):
+            return
+        self.__trigger_hash.sync(self.triggers)
+        self.__trigger_order = {t: i for i, t in enumerate(self.triggers)}
+        self.__indexed_triggers = self.triggers
+        self.__indexed_trigger_count = len(self.triggers)
+        self.__trigger_player_location = None
+
     def __update_triggers(self, delta_time, entities, manager):
-        for t in self.triggers:
-            if t.bounds.colliderect(self.camera_viewport.bounds):
-                t.update(delta_time, entities, manager)
+        "Only the player sets off triggers, so they are only checked when the player moved or pressed a button."
+        self.__sync_triggers()
+        if self.player is None or self.player.spatial_hash is not self.spatial_hash:
+            return
+
+        location = (self.player.x, self.player.y)
+        if location == self.__trigger_player_location and not self.player.input.pressing(InputType.A):
+            return
+        self.__trigger_player_location = location
+
+        triggers = self.__trigger_hash.query(self.player.bounds)
+        triggers.sort(key=self.__trigger_order.__getitem__)
+        for t in triggers:
+            # A trigger may have just moved the player to another scene.
+            if self.player not in entities:
+                break
+            t.update(delta_time, [self.player], manager)
 
     def update_camera(self):
         self.camera_location = Vector2(
@@ -237,23 +467,123 @@ class Scene(object):
 
         self.update_ui()
 
-    def draw(self, surface):
-        for s in self.shapes:
-            s.draw(surface, CameraType.DYNAMIC)
-        for s in self.sprites:
-            if s.bounds.colliderect(self.camera_viewport.bounds):
+    def prefetch(self):
+        "Get ready to be shown, one step per iteration, so the work can be spread over the frames of a transition."
+        self.__sync_entities()
+        yield
+        self.__sync_triggers()
+        yield
+        self._sort_entities()
+        yield
+        if self.__static_layer_is_stale():
+            self.__bake_static_layer()
+            yield
+
+    def __bake_static_layer(self):
+        "Draw every shape and sprite onto one world sized surface so they can be blitted all at once."
+        self.__static_layer = None
+        self.__static_layer_source = (
+            self.shapes, self.sprites, Camera.scale, pygine.resource.CONTENT_VERSION)
+
+        static_objects = self.shapes + self.sprites
+        if len(static_objects) == 0:
+            return
+
+        region = static_objects[0].bounds.unionall(
+            [s.bounds for s in static_objects[1:]])
+        width = int(math.ceil(region.width * Camera.scale))
+        height = int(math.ceil(region.height * Camera.scale))
+        if width * height * 4 > Scene.STATIC_LAYER_LIMIT:
+            return
+
+        self.__static_layer = pygame.Surface(
+            (width, height), pygame.SRCALPHA).convert_alpha()
+        self.__static_layer_origin = Vector2(
+            region.x * Camera.scale, region.y * Camera.scale)
+
+        # Temporarily point the camera at the top left of the layer so the usual draw calls land on it.
+        camera_x, camera_y = Camera.top_left.x, Camera.top_left.y
+        Camera.top_left.x = self.__static_layer_origin.x
+        Camera.top_left.y = self.__static_layer_origin.y
+        for s in static_objects:
+            s.draw(self.__static_layer, CameraType.DYNAMIC)
+        Camera.top_left.x, Camera.top_left.y = camera_x, camera_y
+
+    def __static_layer_is_stale(self):
+        return (
+            self.__static_layer_source is None or
+            self.__static_layer_source[0] is not self.shapes or
+            self.__static_layer_source[1] is not self.sprites or
+            self.__static_layer_source[2] != Camera.scale or
+            self.__static_layer_source[3] != pygine.resource.CONTENT_VERSION
+        )
+
+    def __entities_in_view(self):
+        "The entities in the viewport, back to front."
+        if self.__synced_entities is not self.entities:
+            return [e for e in self.entities if e.bounds.colliderect(self.camera_viewport.bounds)]
+
+        viewport = self.camera_viewport.bounds
+        visible = self.static_index.query(viewport)
+        visible.extend(self.spatial_hash.query(viewport))
+        # Entities that were added since the last sync are not in either index yet.
+        for i in range(len(self.entities) - 1, -1, -1):
+            e = self.entities[i]
+            if e.static or e.spatial_hash is self.spatial_hash:
+                break
+            if e.bounds.colliderect(viewport):
+                visible.append(e)
+        visible.sort(key=self.__depth_key)
+        return visible
+
+    def __draw_static_layer(self, surface):
+        if self.__static_layer_is_stale():
+            self.__bake_static_layer()
+
+        if self.__static_layer is None:
+            for s in self.shapes:
                 s.draw(surface, CameraType.DYNAMIC)
-        for e in self.entities:
-            if e.bounds.colliderect(self.camera_viewport.bounds):
-                e.draw(surface)
+            for s in self.sprites:
+                if s.bounds.colliderect(self.camera_viewport.bounds):
+                    s.draw(surface, CameraType.DYNAMIC)
+            return
+
+        destination = self.__static_layer.get_rect(
+            topleft=(
+                self.__static_layer_origin.x - Camera.top_left.x,
+                self.__static_layer_origin.y - Camera.top_left.y
+            )
+        )
+        visible = destination.clip(surface.get_rect())
+        draw_surface(
+            surface,
+            self.__static_layer,
+            (visible.x, visible.y),
+            tuple(visible.move(-destination.x, -destination.y))
+        )
+
+    def draw(self, surface):
+        # Each layer is collected into a draw list so its sprites are blitted in one batch.
+        start_recording_draw_calls(surface)
+        for t in self.tilemaps:
+            t.draw(surface, CameraType.DYNAMIC, self.camera_viewport.bounds)
+        self.__draw_static_layer(surface)
+        submit_draw_calls(surface, stop_recording_draw_calls())
+
+        start_recording_draw_calls(surface)
+        for e in self.__entities_in_view():
+            e.draw(surface)
         if pygine.globals.debug:
             for t in self.triggers:
                 t.draw(surface, CameraType.DYNAMIC)
             self.camera_viewport.draw(surface, CameraType.DYNAMIC)
+        submit_draw_calls(surface, stop_recording_draw_calls())
 
-        if not isinstance(self, Minigame):
+        if self.show_money:
+            start_recording_draw_calls(surface)
             self.dollar_sign.draw(surface, CameraType.STATIC)
             self.money_ui.draw(surface, CameraType.STATIC)
+            submit_draw_calls(surface, stop_recording_draw_calls())
 
 
 class Village(Scene):
@@ -281,16 +611,9 @@ class Village(Scene):
                 e.apply_an_offset(0, 6)
 
     def __load_trees(self):
-        file = open(
-            '/home/cpi/games/Python/diner-mafia/pygine/assets/scenes/trees_village.csv' if pygine.globals.on_cpi
-            else 'pygine/assets/scenes/trees_village.csv',
-            "r"
-        )
-        for y in range(20):
-            row = file.readline().split(",")
-            for x in range(40):
-                column = row[x]
-                if column.strip() != "-1":
+        for y, row in enumerate(load_grid("trees_village")):
+            for x, cell in enumerate(row):
+                if cell != -1:
                     self.entities.append(Tree(x * 16, y * 16))
 
     def _reset(self):
@@ -411,24 +734,23 @@ class Forest(Scene):
                 e.apply_an_offset(16, 16)
 
     def __load_trees(self):
-        file = open(
-            '/home/cpi/games/Python/diner-mafia/pygine/assets/scenes/trees_forest.csv' if pygine.globals.on_cpi
-            else 'pygine/assets/scenes/trees_forest.csv',
-            "r"
-        )
-        for y in range(15):
-            row = file.readline().split(",")
-            for x in range(20):
-                column = row[x]
-                if column.strip() != "-1":
+        for y, row in enumerate(load_grid("trees_forest")):
+            for x, cell in enumerate(row):
+                if cell != -1:
                     self.entities.append(Tree(x * 16, y * 16))
 
     def _reset(self):
         self.shapes = []
         self.sprites = []
-        for y in range(int(Camera.BOUNDS.height * 2 / 32)):
-            for x in range(int(Camera.BOUNDS.width * 2 / 32)):
-                self.sprites.append(Sprite(x * 32, y * 32, SpriteType.GRASS))
+        self.tilemaps = [
+            TileMap(
+                0, 0,
+                int(Camera.BOUNDS.width * 2 / 32), int(Camera.BOUNDS.height * 2 / 32),
+                32, 32,
+                [SpriteType.GRASS]
+            )
+        ]
+        self.tilemaps[0].fill(0)
 
         self.entities = [
 
@@ -464,17 +786,11 @@ class Ocean(Scene):
         self.song = "song_village.wav"
 
     def __load_bounds(self):
-        file = open(
-            '/home/cpi/games/Python/diner-mafia/pygine/assets/scenes/bounds_ocean.csv' if pygine.globals.on_cpi
-            else 'pygine/assets/scenes/bounds_ocean.csv',
-            "r"
-        )
-        for y in range(15):
-            row = file.readline().split(",")
-            for x in range(20):
-                column = row[x]
-                if column.strip() != "-1":
-                    self.entities.append(Wall(x, y, 1, 1))
+        cells = [[cell != -1 for cell in row] for row in load_grid("bounds_ocean")]
+
+        # Neighbouring solid cells become one Wall.
+        for x, y, width, height in merge_cells(cells):
+            self.entities.append(Wall(x, y, width, height))
 
         for e in self.entities:
             if isinstance(e, Wall):
@@ -688,205 +1004,3 @@ class DinerScene(Scene):
                 SceneType.VILLAGE
             )
         )
-
-
-class Minigame(Scene):
-    def __init__(self):
-        super(Minigame, self).__init__()
-
-    def start_game(self):
-        raise NotImplementedError(
-            "A class that inherits Minigame did not implement the start_game() method")
-
-    def _exit_game(self, end_x, end_y, item, new_scene):
-        self.manager.queue_next_scene(new_scene, Vector2(end_x, end_y))
-        new_player = self.manager.get_scene(new_scene).player
-        new_player.set_location(end_x, end_y)
-        new_player.item_carrying = item
-        new_player.sprite.set_sprite(SpriteType.PLAYER_F)
-
-
-class CoffeeMinigame(Minigame):
-    def __init__(self):
-        super(CoffeeMinigame, self).__init__()
-        self._reset()
-        self._create_triggers()
-        self.song = "song_coffee.wav"
-
-    def start_game(self):
-        self._reset()
-        self.__game_timer.reset()
-        self.__game_timer.start()
-        self.__spawn_timer.reset()
-        self.__spawn_timer.start()
-
-    def _reset(self):
-        self.shapes = [
-            Rectangle(0, 0, 320, 16 * 4, Color.OCEAN_BLUE),
-            Rectangle(0, 16 * 4, 320, 16 * 11, Color.OCEAN_BLUE)
-        ]
-        self.sprites = []
-        self.entities = []
-        self.relay_player(
-            Boat(
-                16 * 4,
-                16 * 9
-            )
-        )
-
-        self.total_walls = int(Camera.BOUNDS.width / 64) + 2
-        self.wall_layers = 6
-        for x in range(self.total_walls):
-            for i in range(0, self.wall_layers):
-                self.entities.append(
-                    SandWall(x * 64, 16 * 2, i, self.wall_layers)
-                )
-
-        self.__game_timer = Timer(35 * 1000)
-        self.__spawn_timer = Timer(500)
-
-        self._sort_entities()
-
-    def _create_triggers(self):
-        pass
-
-    def __spawn_random(self):
-        grid_unit_size = 16
-        rand_x = Camera.BOUNDS.width + 8
-        rand_y = randint(4, 14) * grid_unit_size
-        if randint(1, 10) <= 3:
-            self.entities.append(Octopus(rand_x, rand_y))
-        else:
-            min_offset = 0
-            max_offset = 64
-            self.entities.append(Rock(rand_x, rand_y))
-            for i in range(randint(1, 5)):
-                self.entities.append(
-                    Rock(rand_x + randint(min_offset, max_offset), rand_y + randint(min_offset, max_offset)))
-
-    def update(self, delta_time):
-        self.__game_timer.update(delta_time)
-        if self.__game_timer.done:
-            # Game is over, change scene
-            self._exit_game(12 * 16 + 11, 8 * 16,
-                            Coffee(0, 0, self.player.beans), SceneType.OCEAN)
-        else:
-            if self.player.bounds.top > Camera.BOUNDS.height + 8 or self.player.bounds.right < 0:
-                self._exit_game(12 * 16 + 11, 8 * 16, None, SceneType.OCEAN)
-                return
-
-            self.__spawn_timer.update(delta_time)
-            if self.__spawn_timer.done:
-                if randint(1, 10) <= 5:
-                    self.__spawn_random()
-                self.__spawn_timer.reset()
-                self.__spawn_timer.start()
-
-            for e in self.entities:
-                if isinstance(e, SandWall):
-                    if e.bounds.right - 32 <= self.camera_viewport.bounds.left:
-                        e.set_location(e.x + self.total_walls * 64 - 64, e.y)
-                if isinstance(e, Bullet):
-                    if e.dead:
-                        e.remove = True
-                if e.sprite.x + e.sprite.width < 0:
-                    e.remove = True
-
-            # print(self.camera_viewport.bounds.left)
-            super(CoffeeMinigame, self).update(delta_time)
-
-    def draw(self, surface):
-        draw_rectangle(surface, self.player.playbounds,
-                       CameraType.DYNAMIC, Color.SKY_BLUE)
-        super(CoffeeMinigame, self).draw(surface)
-
-
-class CropMinigame(Scene):
-    def __init__(self):
-        super(CropMinigame, self).__init__()
-
-    def _reset(self):
-        pass
-
-
-class FishMinigame(Minigame):
-    def __init__(self):
-        super(FishMinigame, self).__init__()
-        self.song = "song_coffee.wav"
-
-    def start_game(self):
-        self._reset()
-
-    def total_fish_caught(self):
-        return self.player.total_hooked_fish
-
-    def _reset(self):
-        self.ocean_depth = Camera.BOUNDS.height * 10
-        self.bounds = Rect(0, 0, Camera.BOUNDS.width, self.ocean_depth)
-        self.shapes = [
-            Rectangle(0, 0, Camera.BOUNDS.width,
-                      self.ocean_depth, Color.OCEAN_BLUE),
-            Rectangle(0, self.ocean_depth - 64,
-                      Camera.BOUNDS.width, 64, Color.BLACK),
-        ]
-        self.sprites = []
-        self.entities = []
-        self.total_walls = int(Camera.BOUNDS.height / 64) + 2
-        self.wall_layers = 3
-        for y in range(self.total_walls):
-            for i in range(0, self.wall_layers):
-                self.entities.append(
-                    OceanWall(y * 64, True, i, self.wall_layers))
-                self.entities.append(
-                    OceanWall(y * 64, False, i, self.wall_layers))
-
-        self.fish_spawn_frequency = 1
-        for y in range(0, self.bounds.height, 16):
-            if randint(1, 10) <= int(self.fish_spawn_frequency):
-                self.entities.append(
-                    Fishy(y, True if randint(1, 10) <= 5 else False))
-            self.fish_spawn_frequency = y * 1.0 / self.ocean_depth * 10 + 1
-                
-        self.relay_player(Hook(self.ocean_depth))
-
-        self.entities.sort(key=lambda e: (-(e.layer + 1)
-                                          if isinstance(e, OceanWall) else 100))
-
-    def _create_triggers(self):
-        pass
-
-    def update(self, delta_time):
-        super(FishMinigame, self).update(delta_time)
-
-        if self.player.y < Camera.BOUNDS.height / 2:
-            self._exit_game(
-                7 * 16 + 11, 3 * 16,
-                Fish(0, 0, self.total_fish_caught()),
-                SceneType.OCEAN
-            )
-            return
-
-        for e in self.entities:
-            if isinstance(e, OceanWall):
-                if e.direction == 1 and e.bounds.bottom <= self.camera_viewport.bounds.top + Scene.VIEWPORT_BUFFER:
-                    e.set_location(e.x, e.y + self.total_walls * 64)
-                elif e.direction == -1 and e.bounds.top >= self.camera_viewport.bounds.bottom - Scene.VIEWPORT_BUFFER:
-                    e.set_location(e.x, e.y - self.total_walls * 64)
-
-        self.entities.sort(
-            key=lambda e: (
-                -(e.layer + 1) if isinstance(e, OceanWall)
-                else (100 if isinstance(e, Hook) else 200)
-            )
-        )
-
-    def draw(self, surface):
-        super(FishMinigame, self).draw(surface)
-
-
-class EggsMinigame(Scene):
-    def __init__(self):
-        super(EggsMinigame, self).__init__()
-
-    def _reset(self):
-        pass
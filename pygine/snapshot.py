@@ -0,0 +1,62 @@
+from enum import Enum
+from pygame import Rect
+
+
+class Snapshot(object):
+    "The state of an object, and of every pygine object, list, dict, set and Rect it can reach."
+
+    def __init__(self, root, ignore=()):
+        # Saved states are grouped by how they are restored. Restoring writes them back into the same objects, so
+        # nothing is created again, and surfaces stay shared with the objects that made them.
+        self.lists = []
+        self.collections = []
+        self.rects = []
+        self.attributes = []
+
+        ignored = set(id(o) for o in ignore)
+        seen = set()
+        stack = [root]
+        while len(stack) > 0:
+            obj = stack.pop()
+            if id(obj) in seen or id(obj) in ignored:
+                continue
+            seen.add(id(obj))
+
+            if isinstance(obj, list):
+                self.lists.append((obj, list(obj)))
+                stack.extend(obj)
+            elif isinstance(obj, dict):
+                self.collections.append((obj, dict(obj)))
+                stack.extend(obj.keys())
+                stack.extend(obj.values())
+            elif isinstance(obj, set):
+                self.collections.append((obj, set(obj)))
+                stack.extend(obj)
+            elif isinstance(obj, (tuple, frozenset)):
+                stack.extend(obj)
+            elif isinstance(obj, Rect):
+                self.rects.append((obj, tuple(obj)))
+            elif is_pygine_object(obj):
+                attributes = vars(obj)
+                self.attributes.append((attributes, dict(attributes)))
+                stack.extend(attributes.values())
+
+    def restore(self):
+        for obj, state in self.lists:
+            obj[:] = state
+        for obj, state in self.collections:
+            obj.clear()
+            obj.update(state)
+        for obj, state in self.rects:
+            obj.update(state)
+        for attributes, state in self.attributes:
+            attributes.clear()
+            attributes.update(state)
+
+
+def is_pygine_object(obj):
+    return (
+        hasattr(obj, "__dict__") and
+        type(obj).__module__.startswith("pygine") and
+        not isinstance(obj, (type, Enum))
+    )
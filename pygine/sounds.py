@@ -1,10 +1,30 @@
+import os
 import pygame
-from pygame.mixer import Sound, music
+from collections import OrderedDict
+from pygame.mixer import Channel, Sound, music
 from pygine import globals
 
 MUSIC_PATH = ""
 SOUND_PATH = ""
 current_song = ""
+# prefetch_song reads the first SONG_READ_AHEAD bytes of a song, SONG_READ_SIZE bytes at a time.
+SONG_READ_SIZE = 64 * 1024
+SONG_READ_AHEAD = 256 * 1024
+# How long a song takes to fade in after another one faded out.
+SONG_FADE_MS = 500
+# Whether the song that is playing is fading out. The mixer cannot load another song until it is quiet.
+__fading_out = False
+# Where every song was found. A compressed .ogg made by build_music.py is played instead of the .wav it was made from.
+__song_paths = {}
+
+# Sound effects are decoded once and kept, least recently played first out. They are played on their own reserved
+# channels, so effects fired every frame cannot take more than SOUND_CHANNELS channels.
+SOUND_CACHE_LIMIT = 32
+SOUND_CHANNELS = 6
+__sounds = OrderedDict()
+__channels = []
+# The priority of the effect last played on each of the channels above.
+__channel_priorities = []
 
 
 def load_sound_paths():
@@ -19,17 +39,122 @@ def load_sound_paths():
 
     pygame.mixer.init()
     music.set_volume(0.80)
+    __reserve_channels()
+    preload_sounds()
+
+
+def __reserve_channels():
+    global __channels
+    global __channel_priorities
+    if pygame.mixer.get_num_channels() < SOUND_CHANNELS:
+        pygame.mixer.set_num_channels(SOUND_CHANNELS)
+    pygame.mixer.set_reserved(SOUND_CHANNELS)
+    __channels = [Channel(i) for i in range(SOUND_CHANNELS)]
+    __channel_priorities = [0] * SOUND_CHANNELS
+
+
+def preload_sounds():
+    "Decode every sound effect in SOUND_PATH, so the first time an effect is played it does not have to be read."
+    if not os.path.isdir(SOUND_PATH):
+        return
+    for filename in sorted(os.listdir(SOUND_PATH)):
+        if filename.endswith(".wav") or filename.endswith(".ogg"):
+            load_sound(filename)
+
+
+def load_sound(filename):
+    sound = __sounds.get(filename)
+    if sound is None:
+        sound = Sound(SOUND_PATH + filename)
+        __sounds[filename] = sound
+        if len(__sounds) > SOUND_CACHE_LIMIT:
+            __sounds.popitem(last=False)
+    else:
+        __sounds.move_to_end(filename)
+    return sound
+
+
+def prefetch_song(filename):
+    "Read the start of a song a piece at a time, yielding after every piece, so play_song does not wait on the disk."
+    if filename == "" or filename == current_song:
+        return
+
+    # Nothing is kept, the reads only warm the disk cache. The mixer streams the rest of the song from the file.
+    read = 0
+    with open(__song_path(filename), "rb") as file:
+        while read < SONG_READ_AHEAD:
+            chunk = file.read(SONG_READ_SIZE)
+            if len(chunk) == 0:
+                break
+            read += len(chunk)
+            yield
 
 
-def play_song(filename):
+def __song_path(filename):
+    path = __song_paths.get(filename)
+    if path is None:
+        path = MUSIC_PATH + os.path.splitext(filename)[0] + ".ogg"
+        if not os.path.isfile(path):
+            path = MUSIC_PATH + filename
+        __song_paths[filename] = path
+    return path
+
+
+def fade_out_song(next_song, fade_ms):
+    "Start fading out the song that is playing, if next_song is going to replace it."
+    global __fading_out
+    if next_song != "" and next_song != current_song and music.get_busy():
+        music.fadeout(fade_ms)
+        __fading_out = True
+
+
+def stop_fading_song():
+    "Stop a song that is fading out right away, so play_song can start another one."
+    global current_song
+    global __fading_out
+    if __fading_out:
+        music.stop()
+        current_song = ""
+        __fading_out = False
+
+
+def play_song(filename, fade_ms=0):
+    "Play a song on repeat. Returns False, without doing anything, while the last song is still fading out."
     global current_song
     global MUSIC_PATH
-    if filename != current_song:
-        music.load(MUSIC_PATH + filename)
-        music.play(-1)
-        current_song = filename
+    global __fading_out
+    if filename == current_song:
+        return True
+    # Loading a song while another one fades out would make the mixer wait for the fade, so try again later.
+    if __fading_out and music.get_busy():
+        return False
 
+    __fading_out = False
+    music.load(__song_path(filename))
+    music.play(-1, 0, fade_ms)
+    current_song = filename
+    return True
 
-def play_sound(filename):
-    global SOUND_PATH
-    Sound(SOUND_PATH + filename).play()
+
+def __free_channel(priority):
+    lowest = None
+    for i in range(len(__channels)):
+        if not __channels[i].get_busy():
+            return i
+        if lowest is None or __channel_priorities[i] < __channel_priorities[lowest]:
+            lowest = i
+    # Every channel is busy, so cut off the least important effect, unless it matters more than this one.
+    if lowest is not None and __channel_priorities[lowest] <= priority:
+        return lowest
+    return None
+
+
+def play_sound(filename, priority=0):
+    "Play a sound effect on a reserved channel. When they are all busy and playing more important effects, it is dropped."
+    sound = load_sound(filename)
+    i = __free_channel(priority)
+    if i is None:
+        return None
+    __channels[i].play(sound)
+    __channel_priorities[i] = priority
+    return __channels[i]
@@ -0,0 +1,204 @@
+class SpatialHash(object):
+    "A uniform grid of square cells over the world, used to find the objects near a Rect without looking at all of them."
+
+    def __init__(self, cell_size=16):
+        self.cell_size = cell_size
+        # Cells are grouped by row, so wide queries over a sparse grid only have to look at the cells in use.
+        self.rows = {}
+        # Every object in the grid, mapped to the (left, top, right, bottom) range of cells it is in.
+        self.objects = {}
+
+    def __cell_range(self, rect):
+        return (
+            rect.left // self.cell_size,
+            rect.top // self.cell_size,
+            max(rect.left, rect.right - 1) // self.cell_size,
+            max(rect.top, rect.bottom - 1) // self.cell_size
+        )
+
+    def __add_to_cells(self, obj, cell_range):
+        left, top, right, bottom = cell_range
+        for y in range(top, bottom + 1):
+            row = self.rows.get(y)
+            if row is None:
+                row = {}
+                self.rows[y] = row
+            for x in range(left, right + 1):
+                cell = row.get(x)
+                if cell is None:
+                    cell = {}
+                    row[x] = cell
+                cell[obj] = None
+
+    def __remove_from_cells(self, obj, cell_range):
+        left, top, right, bottom = cell_range
+        for y in range(top, bottom + 1):
+            row = self.rows.get(y)
+            if row is None:
+                continue
+            for x in range(left, right + 1):
+                cell = row.get(x)
+                if cell is not None:
+                    cell.pop(obj, None)
+                    if len(cell) == 0:
+                        del row[x]
+            if len(row) == 0:
+                del self.rows[y]
+
+    def insert(self, obj):
+        if obj in self.objects:
+            self.__remove_from_cells(obj, self.objects[obj])
+        cell_range = self.__cell_range(obj.bounds)
+        self.objects[obj] = cell_range
+        self.__add_to_cells(obj, cell_range)
+        obj.spatial_hash = self
+
+    def remove(self, obj):
+        cell_range = self.objects.pop(obj, None)
+        if cell_range is not None:
+            self.__remove_from_cells(obj, cell_range)
+        if obj.spatial_hash is self:
+            obj.spatial_hash = None
+
+    def update(self, obj):
+        "Move an object to the cells of its current bounds."
+        old_cell_range = self.objects.get(obj)
+        cell_range = self.__cell_range(obj.bounds)
+        if cell_range == old_cell_range:
+            return
+        if old_cell_range is not None:
+            self.__remove_from_cells(obj, old_cell_range)
+        self.objects[obj] = cell_range
+        self.__add_to_cells(obj, cell_range)
+
+    def sync(self, objects):
+        "Make the grid hold exactly the given objects."
+        present = set(objects)
+        for obj in [o for o in self.objects if o not in present]:
+            self.remove(obj)
+        for obj in objects:
+            if obj.spatial_hash is not self:
+                self.insert(obj)
+
+    def query(self, rect):
+        "Every object whose bounds overlap the given Rect."
+        left, top, right, bottom = self.__cell_range(rect)
+        found = []
+        seen = set()
+        for y in range(top, bottom + 1):
+            row = self.rows.get(y)
+            if row is None:
+                continue
+            if len(row) < right - left + 1:
+                cells = [row[x] for x in row if left <= x <= right]
+            else:
+                cells = [row[x] for x in range(left, right + 1) if x in row]
+            for cell in cells:
+                for obj in cell:
+                    if obj not in seen:
+                        seen.add(obj)
+                        if obj.bounds.colliderect(rect):
+                            found.append(obj)
+        return found
+
+    def clear(self):
+        for obj in list(self.objects):
+            self.remove(obj)
+
+
+class StaticIndex(object):
+    "An AABB tree over objects that never move. It is built once and cannot be changed afterwards."
+    LEAF_SIZE = 8
+
+    def __init__(self, objects):
+        self.objects = tuple(objects)
+        # Every node is (bounds, first child, second child, objects). Only leaves have objects.
+        self.nodes = []
+        if len(self.objects) > 0:
+            self.__build(list(self.objects))
+
+    def __build(self, objects):
+        bounds = objects[0].bounds.unionall([o.bounds for o in objects[1:]])
+        index = len(self.nodes)
+        if len(objects) <= StaticIndex.LEAF_SIZE:
+            self.nodes.append((bounds, -1, -1, tuple(objects)))
+            return index
+
+        self.nodes.append(None)
+        if bounds.width >= bounds.height:
+            objects.sort(key=lambda o: o.bounds.centerx)
+        else:
+            objects.sort(key=lambda o: o.bounds.centery)
+        middle = len(objects) // 2
+        first = self.__build(objects[:middle])
+        second = self.__build(objects[middle:])
+        self.nodes[index] = (bounds, first, second, None)
+        return index
+
+    def query(self, rect):
+        "Every object whose bounds overlap the given Rect."
+        found = []
+        if len(self.nodes) == 0:
+            return found
+
+        stack = [0]
+        while len(stack) > 0:
+            bounds, first, second, objects = self.nodes[stack.pop()]
+            if not bounds.colliderect(rect):
+                continue
+            if objects is None:
+                stack.append(second)
+                stack.append(first)
+                continue
+            for obj in objects:
+                if obj.bounds.colliderect(rect):
+                    found.append(obj)
+        return found
+
+
+class Proximity(object):
+    "Tells registered objects when a target comes within, or goes out of, their radius."
+
+    def __init__(self, spatial_hash):
+        # The objects have to be in this hash, it is used to find the ones near the target.
+        self.spatial_hash = spatial_hash
+        self.radii = {}
+        self.inside = set()
+        self.__largest_radius = 0
+
+    def register(self, obj, radius):
+        self.radii[obj] = radius
+        self.__largest_radius = max(self.__largest_radius, radius)
+
+    def unregister(self, obj):
+        self.radii.pop(obj, None)
+        self.inside.discard(obj)
+
+    def sync(self, radii):
+        "Watch exactly the objects in the given {object: radius} dictionary."
+        self.radii = dict(radii)
+        self.inside &= set(self.radii)
+        self.__largest_radius = max(self.radii.values()) if len(self.radii) > 0 else 0
+
+    def update(self, target, entities):
+        "Call enter_proximity(target, entities) or leave_proximity(target, entities) on objects the target crossed into or out of."
+        reach = int(self.__largest_radius) + 1
+        area = target.bounds.inflate(reach * 2, reach * 2)
+
+        inside = set()
+        for obj in self.spatial_hash.query(area):
+            radius = self.radii.get(obj)
+            if radius is None:
+                continue
+            x = obj.center.x - target.center.x
+            y = obj.center.y - target.center.y
+            if x * x + y * y <= radius * radius:
+                inside.add(obj)
+
+        for obj in self.inside:
+            if obj not in inside:
+                obj.leave_proximity(target, entities)
+        for obj in inside:
+            if obj not in self.inside:
+                obj.enter_proximity(target, entities)
+        self.inside = inside
@@ -1,12 +1,77 @@
+import copy
+import math
+import pygame
+from collections import OrderedDict
 from enum import IntEnum
+from pygame import Rect
 from pygine.base import PygineObject
-from pygine.geometry import Circle
+from pygine.draw import draw_image
+from pygine.resource import COLOR_KEY
 from pygine.utilities import Camera, CameraType, Color
 
+# Every transition is drawn as one full screen frame. Frames are keyed on (transition class, frame key, width, height)
+# and evicted least recently used first. Mask frames are colour keyed and RLE accelerated, so they are small.
+TRANSITION_FRAME_CACHE_LIMIT = 128
+__frames = OrderedDict()
+
 
 class TransitionType(IntEnum):
     PINHOLE_OPEN = 1
     PINHOLE_CLOSE = 2
+    FADE_OPEN = 3
+    FADE_CLOSE = 4
+    IRIS_OPEN = 5
+    IRIS_CLOSE = 6
+    WIPE_OPEN = 7
+    WIPE_CLOSE = 8
+
+
+CLOSING_TRANSITION_TYPES = {
+    TransitionType.PINHOLE_CLOSE,
+    TransitionType.FADE_CLOSE,
+    TransitionType.IRIS_CLOSE,
+    TransitionType.WIPE_CLOSE,
+}
+
+
+def create_transition(transition_type):
+    if transition_type in (TransitionType.PINHOLE_OPEN, TransitionType.PINHOLE_CLOSE):
+        return Pinhole(transition_type)
+    if transition_type in (TransitionType.FADE_OPEN, TransitionType.FADE_CLOSE):
+        return Fade(transition_type)
+    if transition_type in (TransitionType.IRIS_OPEN, TransitionType.IRIS_CLOSE):
+        return Iris(transition_type)
+    if transition_type in (TransitionType.WIPE_OPEN, TransitionType.WIPE_CLOSE):
+        return Wipe(transition_type)
+    raise ValueError("Unknown transition type {}".format(transition_type))
+
+
+def transition_frame(transition_class, key, width, height, build):
+    "Get a cached frame, or build it with build(key, width, height) if there is none yet."
+    cache_key = (transition_class, key, width, height)
+    frame = __frames.get(cache_key)
+    if frame is None:
+        frame = build(key, width, height)
+        __frames[cache_key] = frame
+        if len(__frames) > TRANSITION_FRAME_CACHE_LIMIT:
+            __frames.popitem(last=False)
+    else:
+        __frames.move_to_end(cache_key)
+    return frame
+
+
+def clear_transition_frames():
+    __frames.clear()
+
+
+def mask_frame(width, height, draw_hole):
+    "A black frame with a see-through hole drawn by draw_hole(surface, color)."
+    frame = pygame.Surface((width, height)).convert()
+    frame.fill(Color.BLACK)
+    if draw_hole is not None:
+        draw_hole(frame, COLOR_KEY)
+        frame.set_colorkey(COLOR_KEY, pygame.RLEACCEL)
+    return frame
 
 
 class Transition(PygineObject):
@@ -26,12 +91,49 @@ class Transition(PygineObject):
         raise NotImplementedError(
             "A class that inherits Transition did not implement the update(delta_time) method")
 
-    def _draw(self, surface):
+    def duration(self, delta_time=1 / 60.0):
+        "How many seconds the transition takes from its start, found by running a copy of it."
+        transition = copy.copy(self)
+        transition._reset()
+        seconds = 0
+        while not transition.done:
+            transition.update(delta_time)
+            seconds += delta_time
+        return seconds
+
+    def _frame_key(self):
+        "A hashable description of the current frame, or None when nothing needs to be drawn."
         raise NotImplementedError(
-            "A class that inherits Transition did not implement the draw(surface) method")
+            "A class that inherits Transition did not implement the _frame_key() method")
+
+    def _build_frame(self, key, width, height):
+        raise NotImplementedError(
+            "A class that inherits Transition did not implement the _build_frame(key, width, height) method")
+
+    def draw(self, surface):
+        key = self._frame_key()
+        if key is None:
+            return
+
+        frame = transition_frame(
+            self.__class__,
+            key,
+            int(Camera.BOUNDS.width * Camera.scale),
+            int(Camera.BOUNDS.height * Camera.scale),
+            self._build_frame
+        )
+        draw_image(
+            surface,
+            frame,
+            Rect(0, 0, Camera.BOUNDS.width, Camera.BOUNDS.height),
+            CameraType.STATIC
+        )
 
 
 class Pinhole(Transition):
+    # The radius of the hole is rounded down to a multiple of this, so every transition shares the same few frames.
+    RADIUS_STEP = 4
+
     def __init__(self, type):
         super(Pinhole, self).__init__(100, 250)
         self.type = type
@@ -41,62 +143,125 @@ class Pinhole(Transition):
         self.speed = self.default_speed
         self.done = False
         greater_camera_dimesion = Camera.BOUNDS.width if Camera.BOUNDS.width > Camera.BOUNDS.height else Camera.BOUNDS.height
+        self.radius = greater_camera_dimesion * 0.75
+        self.corner_distance = math.hypot(self.width / 2, self.height / 2)
         if self.type == TransitionType.PINHOLE_OPEN:
-            self.circle = Circle(
-                self.x,
-                self.y,
-                greater_camera_dimesion * 0.75,
-                Color.BLACK,
-                greater_camera_dimesion * 0.75 - 1
-            )
-            self.circle2 = Circle(
-                self.x,
-                self.y - 1,
-                greater_camera_dimesion * 0.75,
-                Color.BLACK,
-                greater_camera_dimesion * 0.75 - 1
-            )
+            self.thickness = self.radius - 1
         if self.type == TransitionType.PINHOLE_CLOSE:
-            self.circle = Circle(
-                self.x,
-                self.y,
-                greater_camera_dimesion * 0.75,
-                Color.BLACK,
-                1
-            )
-            self.circle2 = Circle(
-                self.x,
-                self.y - 1,
-                greater_camera_dimesion * 0.75,
-                Color.BLACK,
-                1
-            )
+            self.thickness = 1
 
     def update(self, delta_time):
         if self.done:
             return
 
         if self.type == TransitionType.PINHOLE_OPEN:
-            if self.circle.thickness > 10:
-                self.circle.set_thickness(
-                    self.circle.thickness - self.speed * delta_time)
-                self.circle2.set_thickness(self.circle.thickness)
+            if self.thickness > 10:
+                self.thickness -= self.speed * delta_time
             else:
-                self.circle.set_thickness(10)
-                self.circle2.set_thickness(self.circle.thickness)
+                self.thickness = 10
                 self.done = True
         if self.type == TransitionType.PINHOLE_CLOSE:
-            if self.circle.thickness < self.circle.radius:
-                self.circle.set_thickness(
-                    self.circle.thickness + self.speed * delta_time)
-                self.circle2.set_thickness(self.circle.thickness)
+            if self.thickness < self.radius:
+                self.thickness += self.speed * delta_time
             else:
-                self.circle.set_thickness(0)
-                self.circle2.set_thickness(self.circle.thickness)
+                self.thickness = self.radius
                 self.done = True
 
         self.speed += self.acceleration * delta_time
 
-    def draw(self, surface):
-        self.circle.draw(surface, CameraType.STATIC)
-        self.circle2.draw(surface, CameraType.STATIC)
+    def _frame_key(self):
+        hole_radius = self.radius - self.thickness
+        if hole_radius >= self.corner_distance:
+            return None
+        return max(0, int(hole_radius / Pinhole.RADIUS_STEP) * Pinhole.RADIUS_STEP)
+
+    def _build_frame(self, key, width, height):
+        if key == 0:
+            return mask_frame(width, height, None)
+        return mask_frame(
+            width,
+            height,
+            lambda frame, color: pygame.draw.circle(
+                frame, color, (width // 2, height // 2), int(key * Camera.scale))
+        )
+
+
+class Sweep(Transition):
+    "A transition that covers the screen as its coverage goes from 0 to 1, and uncovers it going back."
+    # Coverage is rounded to a multiple of 1 / STEPS, so every transition shares the same few frames.
+    STEPS = 64
+
+    def __init__(self, type, speed=1.25, acceleration=1):
+        super(Sweep, self).__init__(speed, acceleration)
+        self.type = type
+        self._reset()
+
+    def _reset(self):
+        self.speed = self.default_speed
+        self.done = False
+        self.closing = self.type in CLOSING_TRANSITION_TYPES
+        self.coverage = 0 if self.closing else 1
+
+    def update(self, delta_time):
+        if self.done:
+            return
+
+        if self.closing:
+            self.coverage += self.speed * delta_time
+            if self.coverage >= 1:
+                self.coverage = 1
+                self.done = True
+        else:
+            self.coverage -= self.speed * delta_time
+            if self.coverage <= 0:
+                self.coverage = 0
+                self.done = True
+
+        self.speed += self.acceleration * delta_time
+
+    def _frame_key(self):
+        step = int(round(self.coverage * self.__class__.STEPS))
+        if step <= 0:
+            return None
+        return step
+
+
+class Fade(Sweep):
+    STEPS = 16
+
+    def _build_frame(self, key, width, height):
+        frame = mask_frame(width, height, None)
+        if key < Fade.STEPS:
+            frame.set_alpha(int(255 * key / Fade.STEPS), pygame.RLEACCEL)
+        return frame
+
+
+class Iris(Sweep):
+    def _build_frame(self, key, width, height):
+        if key == Iris.STEPS:
+            return mask_frame(width, height, None)
+        opening = 1 - key / Iris.STEPS
+        hole = Rect(0, 0, int(width * opening), int(height * opening))
+        hole.center = (width // 2, height // 2)
+        return mask_frame(width, height, lambda frame, color: frame.fill(color, hole))
+
+
+class Wipe(Sweep):
+    "Covers the screen from the left, and uncovers it from the left as well."
+
+    def _frame_key(self):
+        step = super(Wipe, self)._frame_key()
+        if step is None:
+            return None
+        return (step, self.closing)
+
+    def _build_frame(self, key, width, height):
+        step, closing = key
+        if step == Wipe.STEPS:
+            return mask_frame(width, height, None)
+        covered = int(width * step / Wipe.STEPS)
+        if closing:
+            hole = Rect(covered, 0, width - covered, height)
+        else:
+            hole = Rect(0, 0, width - covered, height)
+        return mask_frame(width, height, lambda frame, color: frame.fill(color, hole))
@@ -68,13 +68,13 @@ class MinigameTrigger(Trigger):
 
     def _move_entity_to_next_scene(self, entity, manager):
         assert (isinstance(entity, Actor)), "Should only relay actors!"
-        manager.queue_next_scene(self.next_scene, self.end_location)
+        # The minigame is started while the leave transition plays, instead of on this frame.
+        manager.queue_next_scene(self.next_scene, self.end_location, start_game=True)
 
     def __collision(self, entities, manager):
         for e in entities:
             if self._valid_entity(e) and e.bounds.colliderect(self.bounds):
                 self._move_entity_to_next_scene(e, manager)
-                manager.get_scene(self.next_scene).start_game()
 
     def update(self, delta_time, entities, manager):
         self.__collision(entities, manager)
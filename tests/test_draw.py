@@ -0,0 +1,85 @@
+import pygame
+from pygine.draw import changed_draw_call_areas, draw_surface, replay_draw_calls
+from pygine.root import Game, GameState
+
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+
+
+def rectangle(color, area):
+    return (area, pygame.draw.rect, (color, area))
+
+
+def redraw(surface, previous_draw_calls, draw_calls):
+    "Redraw only the changed areas, the way Game does with dirty rectangles enabled."
+    for area in changed_draw_call_areas(previous_draw_calls, draw_calls):
+        area = pygame.Rect(area)
+        surface.set_clip(area)
+        surface.fill((0, 0, 0), area)
+        replay_draw_calls(surface, draw_calls, area)
+    surface.set_clip(None)
+
+
+def test_unchanged_draw_calls_have_no_areas():
+    draw_calls = [rectangle(RED, (0, 0, 8, 8)), rectangle(BLUE, (4, 4, 8, 8))]
+    assert changed_draw_call_areas(draw_calls, list(draw_calls)) == []
+
+
+def test_added_draw_call_only_marks_its_own_area():
+    red = rectangle(RED, (0, 0, 8, 8))
+    blue = rectangle(BLUE, (20, 20, 8, 8))
+    added = rectangle(BLUE, (40, 0, 4, 4))
+    assert changed_draw_call_areas([red, blue], [red, added, blue]) == [(40, 0, 4, 4)]
+
+
+def test_swapped_overlapping_draw_calls_are_redrawn():
+    red = rectangle(RED, (0, 0, 8, 8))
+    blue = rectangle(BLUE, (4, 4, 8, 8))
+    previous_draw_calls = [red, blue]
+    draw_calls = [blue, red]
+
+    surface = pygame.Surface((16, 16))
+    replay_draw_calls(surface, previous_draw_calls)
+    assert surface.get_at((6, 6)) == BLUE
+
+    redraw(surface, previous_draw_calls, draw_calls)
+    expected = pygame.Surface((16, 16))
+    replay_draw_calls(expected, draw_calls)
+    assert surface.get_at((6, 6)) == RED
+    assert pygame.image.tobytes(surface, "RGB") == pygame.image.tobytes(expected, "RGB")
+
+
+class SpritesScene(object):
+    "Stands in for the SceneManager, and draws a sprite at every location."
+
+    def __init__(self, sprite, locations):
+        self.sprite = sprite
+        self.locations = locations
+
+    def draw(self, surface):
+        for location in self.locations:
+            draw_surface(surface, self.sprite, location, (0, 0) + self.sprite.get_size())
+
+
+def test_separate_dirty_areas_match_a_full_redraw(monkeypatch):
+    monkeypatch.setattr(Game, "state", GameState.RUNNING)
+    sprite = pygame.Surface((4, 4))
+    sprite.fill(RED)
+    game = Game.__new__(Game)
+    game.render_natively = True
+    game.dirty_rectangles = True
+    game._Game__previous_draw_calls = None
+    game.scene_manager = SpritesScene(sprite, [(0, 0), (40, 40)])
+
+    surface = pygame.Surface((64, 64))
+    assert game._Game__draw_scene(surface) is None
+
+    # Both sprites move, so two areas far apart are dirty and each one has to be cleared.
+    game.scene_manager.locations = [(2, 0), (42, 40)]
+    areas = game._Game__draw_scene(surface)
+    assert areas is not None and len(areas) == 2
+
+    expected = pygame.Surface((64, 64))
+    replay_draw_calls(expected, [((0, 0, 64, 64), pygame.Surface.blit, (sprite, location))
+                                 for location in game.scene_manager.locations])
+    assert pygame.image.tobytes(surface, "RGB") == pygame.image.tobytes(expected, "RGB")
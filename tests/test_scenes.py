@@ -0,0 +1,44 @@
+import os
+import random
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from pygine.entities import NPC, NPCType
+from pygine.root import Game
+
+
+@pytest.fixture(scope="module")
+def game():
+    random.seed(1)
+    return Game()
+
+
+def test_speech_bubbles_stay_in_sync_when_one_leaves_and_another_enters(game):
+    village = game.scene_manager.get_current_scene()
+    first = NPC(100, 10, NPCType.MALE, can_move=False)
+    second = NPC(200, 10, NPCType.FEMALE, can_move=False)
+    village.relay_entity(first)
+    village.relay_entity(second)
+
+    player = village.player
+    player.set_location(first.x + 12, first.y)
+    for _ in range(2):
+        village.update(1 / 60.0)
+    assert first.speech_bubble in village.entities
+
+    # Leaving the first NPC removes its bubble and entering the second one appends a bubble in the same frame, so the
+    # number of entities does not change.
+    player.set_location(second.x + 12, second.y)
+    count = len(village.entities)
+    village.update(1 / 60.0)
+    assert len(village.entities) == count
+    assert first.speech_bubble not in village.entities
+    assert second.speech_bubble in village.entities
+
+    village.update(1 / 60.0)
+    assert first.speech_bubble not in village.dynamic_entities
+    assert first.speech_bubble.spatial_hash is not village.spatial_hash
+    assert second.speech_bubble in village.dynamic_entities
+    assert second.speech_bubble.spatial_hash is village.spatial_hash